@@ -14,3 +14,34 @@ GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 
 # Logs
 DEBUG = os.getenv("DEBUG", "false").lower() == "true"
+
+# Crawl queue
+CRAWL_QUEUE_PATH = os.getenv("CRAWL_QUEUE_PATH", "crawl_queue.db")
+CRAWL_RESUME_WINDOW_MINUTES = float(os.getenv("CRAWL_RESUME_WINDOW_MINUTES", "60"))
+
+# Playwright lightweight mode
+PLAYWRIGHT_BLOCKED_RESOURCE_TYPES = [t.strip() for t in os.getenv("PLAYWRIGHT_BLOCKED_RESOURCE_TYPES", "image,media,font,stylesheet").split(",") if t.strip()]
+PLAYWRIGHT_BLOCKED_DOMAINS = [d.strip() for d in os.getenv(
+    "PLAYWRIGHT_BLOCKED_DOMAINS",
+    "google-analytics.com,googletagmanager.com,doubleclick.net,googlesyndication.com,facebook.net,hotjar.com,segment.io,segment.com,mixpanel.com,amplitude.com,datadoghq-browser-agent.com,intercom.io,criteo.com,linkedin.com,tiktok.com"
+).split(",") if d.strip()]
+PLAYWRIGHT_ALLOWED_DOMAINS = [d.strip() for d in os.getenv("PLAYWRIGHT_ALLOWED_DOMAINS", "").split(",") if d.strip()]
+PLAYWRIGHT_STORAGE_STATE_DIR = os.getenv("PLAYWRIGHT_STORAGE_STATE_DIR", ".playwright_state")
+
+# Job search index
+JOB_INDEX_PATH = os.getenv("JOB_INDEX_PATH", "jobs_index.db")
+
+# llm router
+LLM_BACKENDS = os.getenv("LLM_BACKENDS")
+LLM_ROUTES = os.getenv("LLM_ROUTES")
+LLM_MAX_CONCURRENCY = os.getenv("LLM_MAX_CONCURRENCY")
+LLM_TOKENS_PER_MINUTE = os.getenv("LLM_TOKENS_PER_MINUTE")
+LLM_HEDGE_AFTER_SECONDS = float(os.getenv("LLM_HEDGE_AFTER_SECONDS", "0")) or None
+
+# Refresh scheduler
+SCHEDULER_DB_PATH = os.getenv("SCHEDULER_DB_PATH", "scheduler.db")
+SCHEDULER_FETCHES_PER_HOUR = int(os.getenv("SCHEDULER_FETCHES_PER_HOUR", "600"))
+SCHEDULER_LLM_TOKENS_PER_HOUR = int(os.getenv("SCHEDULER_LLM_TOKENS_PER_HOUR", "500000"))
+SCHEDULER_MIN_INTERVAL_MINUTES = int(os.getenv("SCHEDULER_MIN_INTERVAL_MINUTES", "15"))
+SCHEDULER_MAX_INTERVAL_MINUTES = int(os.getenv("SCHEDULER_MAX_INTERVAL_MINUTES", "1440"))
+SCHEDULER_MAX_PAGES = int(os.getenv("SCHEDULER_MAX_PAGES", "10"))
@@ -0,0 +1,312 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from config import CRAWL_QUEUE_PATH, CRAWL_RESUME_WINDOW_MINUTES
+
+
+class CrawlQueue:
+    """
+    Durable work queue of crawl tasks backed by SQLite.
+
+    Each task belongs to a run (one search of one scraper) and has a kind
+    (e.g. "listing" or "detail"), a URL, an optional JSON payload, a state,
+    a retry counter and a lease. Completed tasks keep their JSON result so a
+    restarted run resumes where it stopped without fetching pages or calling
+    the LLM again for work that is already done. Runs older than the resume
+    window are deleted instead of resumed, their listing pages are stale.
+
+    Attributes:
+        db_path (str): Path of the SQLite database (":memory:" for a throwaway queue)
+        lease_seconds (int): How long a leased task is reserved for its worker
+        max_retries (int): Number of attempts before a task is marked as failed
+        backoff_seconds (float): Delay before the first retry of a failed task, doubled at each attempt
+        resume_window_seconds (float): Age after which a run is started over instead of resumed
+    """
+
+    PENDING = "pending"
+    LEASED = "leased"
+    DONE = "done"
+    FAILED = "failed"
+
+    def __init__(self, db_path: str = CRAWL_QUEUE_PATH, lease_seconds: int = 600, max_retries: int = 3,
+                 backoff_seconds: float = 30, resume_window_seconds: float = CRAWL_RESUME_WINDOW_MINUTES * 60):
+        """
+        Open (and create if needed) the queue database.
+
+        Args:
+            db_path: Path of the SQLite database file
+            lease_seconds: Duration of a task lease in seconds
+            max_retries: Maximum number of attempts per task
+            backoff_seconds: Delay before the first retry of a failed task
+            resume_window_seconds: Age in seconds after which a run is started over instead of resumed
+        """
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.resume_window_seconds = resume_window_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS crawl_tasks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                run_id TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                url TEXT NOT NULL,
+                payload TEXT,
+                state TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                lease_expires REAL,
+                result TEXT,
+                error TEXT,
+                not_before REAL,
+                updated_at REAL NOT NULL,
+                UNIQUE (run_id, kind, url)
+            )
+            """
+        )
+        # Queues created before retries were delayed have no not_before column
+        columns = [row["name"] for row in self._conn.execute("PRAGMA table_info(crawl_tasks)")]
+        if "not_before" not in columns:
+            self._conn.execute("ALTER TABLE crawl_tasks ADD COLUMN not_before REAL")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_crawl_tasks_run_state ON crawl_tasks (run_id, state, id)"
+        )
+        has_runs = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'crawl_runs'"
+        ).fetchone()
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS crawl_runs (run_id TEXT PRIMARY KEY, created_at REAL NOT NULL)"
+        )
+        if not has_runs:
+            # Runs of older queues are dated by their oldest task
+            self._conn.execute(
+                "INSERT OR IGNORE INTO crawl_runs (run_id, created_at) "
+                "SELECT run_id, MIN(updated_at) FROM crawl_tasks GROUP BY run_id"
+            )
+
+    def start_run(self, run_id: str) -> bool:
+        """
+        Register a run before enqueuing its tasks, or resume it.
+
+        Runs created more than resume_window_seconds ago are deleted first
+        (including runs orphaned by a change of criteria), unless a live lease
+        shows another process is still working on them. A resumed run gives
+        its failed tasks a new set of attempts.
+
+        Args:
+            run_id: Identifier of the crawl run
+
+        Returns:
+            True if an existing run is resumed, False if the run starts fresh
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                stale = (
+                    "SELECT run_id FROM crawl_runs WHERE created_at < ? AND NOT EXISTS ("
+                    "SELECT 1 FROM crawl_tasks WHERE crawl_tasks.run_id = crawl_runs.run_id "
+                    "AND state = ? AND lease_expires >= ?)"
+                )
+                params = (now - self.resume_window_seconds, self.LEASED, now)
+                self._conn.execute(f"DELETE FROM crawl_tasks WHERE run_id IN ({stale})", params)
+                self._conn.execute(f"DELETE FROM crawl_runs WHERE run_id IN ({stale})", params)
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO crawl_runs (run_id, created_at) VALUES (?, ?)", (run_id, now)
+                )
+                resumed = cursor.rowcount == 0
+                if resumed:
+                    self._conn.execute(
+                        "UPDATE crawl_tasks SET state = ?, attempts = 0, not_before = NULL, updated_at = ? "
+                        "WHERE run_id = ? AND state = ?",
+                        (self.PENDING, now, run_id, self.FAILED)
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return resumed
+
+    def enqueue(self, run_id: str, kind: str, url: str, payload: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Add a task to a run. Enqueuing the same (run_id, kind, url) twice is a no-op.
+
+        Args:
+            run_id: Identifier of the crawl run
+            kind: Task kind (e.g. "listing", "detail")
+            url: URL to fetch
+            payload: Optional JSON-serializable data carried with the task
+
+        Returns:
+            True if the task was created, False if it already existed
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO crawl_tasks (run_id, kind, url, payload, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (run_id, kind, url, json.dumps(payload, default=str) if payload is not None else None, time.time())
+            )
+            return cursor.rowcount > 0
+
+    def lease(self, run_id: str, kind: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Reserve the oldest available task of a run.
+
+        Pending tasks whose retry delay is over and tasks whose lease has
+        expired are both available.
+
+        Args:
+            run_id: Identifier of the crawl run
+            kind: Restrict to one task kind, or None for any kind
+
+        Returns:
+            The leased task as a dictionary, or None if nothing is available
+        """
+        now = time.time()
+        query = (
+            "SELECT * FROM crawl_tasks WHERE run_id = ? "
+            "AND ((state = ? AND (not_before IS NULL OR not_before <= ?)) OR (state = ? AND lease_expires < ?))"
+        )
+        params = [run_id, self.PENDING, now, self.LEASED, now]
+        if kind:
+            query += " AND kind = ?"
+            params.append(kind)
+        query += " ORDER BY id LIMIT 1"
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(query, params).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+                self._conn.execute(
+                    "UPDATE crawl_tasks SET state = ?, attempts = attempts + 1, lease_expires = ?, updated_at = ? WHERE id = ?",
+                    (self.LEASED, now + self.lease_seconds, now, row["id"])
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        task = self._row_to_task(row)
+        task["attempts"] += 1
+        task["state"] = self.LEASED
+        return task
+
+    def complete(self, task_id: int, result: Any) -> None:
+        """
+        Mark a task as done and store its result.
+
+        Args:
+            task_id: Identifier of the task
+            result: JSON-serializable result of the task
+        """
+        with self._lock:
+            self._conn.execute(
+                "UPDATE crawl_tasks SET state = ?, result = ?, error = NULL, lease_expires = NULL, updated_at = ? WHERE id = ?",
+                (self.DONE, json.dumps(result, default=str), time.time(), task_id)
+            )
+
+    def fail(self, task_id: int, error: Optional[str] = None) -> None:
+        """
+        Record a failed attempt. The task goes back to pending until it runs out of retries,
+        and is only leased again after an exponential backoff delay.
+
+        Args:
+            task_id: Identifier of the task
+            error: Error message of the attempt
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE crawl_tasks SET state = CASE WHEN attempts >= ? THEN ? ELSE ? END, "
+                "error = ?, lease_expires = NULL, not_before = ? * (1 << (attempts - 1)) + ?, "
+                "updated_at = ? WHERE id = ?",
+                (self.max_retries, self.FAILED, self.PENDING, error, self.backoff_seconds, now, now, task_id)
+            )
+
+    def next_retry_at(self, run_id: str) -> Optional[float]:
+        """
+        Get the time the next delayed task of a run becomes available.
+
+        Args:
+            run_id: Identifier of the crawl run
+
+        Returns:
+            Timestamp of the earliest delayed retry, or None if no task is waiting
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MIN(not_before) AS not_before FROM crawl_tasks WHERE run_id = ? AND state = ?",
+                (run_id, self.PENDING)
+            ).fetchone()
+        return row["not_before"]
+
+    def results(self, run_id: str, kind: Optional[str] = None) -> List[Any]:
+        """
+        Get the results of the completed tasks of a run, in enqueue order.
+
+        Args:
+            run_id: Identifier of the crawl run
+            kind: Restrict to one task kind, or None for any kind
+
+        Returns:
+            List of task results
+        """
+        query = "SELECT result FROM crawl_tasks WHERE run_id = ? AND state = ?"
+        params = [run_id, self.DONE]
+        if kind:
+            query += " AND kind = ?"
+            params.append(kind)
+        query += " ORDER BY id"
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [json.loads(row["result"]) for row in rows]
+
+    def stats(self, run_id: str) -> Dict[str, int]:
+        """
+        Count the tasks of a run by state.
+
+        Args:
+            run_id: Identifier of the crawl run
+
+        Returns:
+            Dictionary mapping each state to its number of tasks
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT state, COUNT(*) AS n FROM crawl_tasks WHERE run_id = ? GROUP BY state", (run_id,)
+            ).fetchall()
+        counts = {state: 0 for state in (self.PENDING, self.LEASED, self.DONE, self.FAILED)}
+        counts.update({row["state"]: row["n"] for row in rows})
+        return counts
+
+    def clear_run(self, run_id: str) -> None:
+        """
+        Delete a run and its tasks, so the next search with the same criteria starts fresh.
+
+        Args:
+            run_id: Identifier of the crawl run
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM crawl_tasks WHERE run_id = ?", (run_id,))
+            self._conn.execute("DELETE FROM crawl_runs WHERE run_id = ?", (run_id,))
+
+    def close(self) -> None:
+        """
+        Close the database connection.
+        """
+        self._conn.close()
+
+    def _row_to_task(self, row: sqlite3.Row) -> Dict[str, Any]:
+        task = dict(row)
+        task["payload"] = json.loads(task["payload"]) if task["payload"] else None
+        task["result"] = json.loads(task["result"]) if task["result"] else None
+        return task
@@ -0,0 +1,95 @@
+from typing import List, Optional, Iterable
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from models.job_record import JobRecord
+
+
+def jobs_parquet_schema() -> pa.Schema:
+    """
+    Builds the Arrow schema of the Parquet exports.
+
+    Every field is text: dictionary-encoded for the categorical fields, large
+    strings otherwise. Declaring it keeps the column types of a file stable
+    even when a batch has no value at all for a field.
+
+    Returns:
+        Arrow schema with one column per JobRecord field
+    """
+    return pa.schema([
+        pa.field(field, pa.dictionary(pa.int32(), pa.string()) if field in JobRecord.CATEGORICAL_FIELDS
+                 else pa.large_string())
+        for field in JobRecord.__slots__
+    ])
+
+
+def jobs_to_dataframe(records: Iterable[JobRecord]) -> pd.DataFrame:
+    """
+    Builds a columnar DataFrame from job records.
+
+    Columns are filled field by field from the record slots, without an
+    intermediate dict per job. Low-cardinality columns are categorical.
+
+    Args:
+        records: Job records
+
+    Returns:
+        DataFrame with one column per JobRecord field
+    """
+    records = list(records)
+    columns = {field: [getattr(record, field) for record in records] for field in JobRecord.__slots__}
+    df = pd.DataFrame(columns, columns=list(JobRecord.__slots__))
+    for field in JobRecord.CATEGORICAL_FIELDS:
+        df[field] = df[field].astype('category')
+    return df
+
+
+def export_jobs_to_parquet(records: Iterable[JobRecord], path: str, compression: str = 'zstd') -> int:
+    """
+    Writes job records to a Parquet file.
+
+    Columns follow jobs_parquet_schema(): company, location, contract type,
+    remote status and source are dictionary-encoded.
+
+    Args:
+        records: Job records
+        path: Destination Parquet file
+        compression: Parquet compression codec
+
+    Returns:
+        Number of exported jobs
+    """
+    df = jobs_to_dataframe(records)
+    table = pa.Table.from_pandas(df, schema=jobs_parquet_schema(), preserve_index=False)
+    pq.write_table(table, path, compression=compression, use_dictionary=list(JobRecord.CATEGORICAL_FIELDS))
+    return len(df)
+
+
+def load_jobs_dataframe(path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Reads a Parquet export as a DataFrame, dictionary columns as categoricals.
+
+    Args:
+        path: Parquet file
+        columns: Columns to read, or None for all. Reading only the needed
+            columns skips the large description fields entirely.
+
+    Returns:
+        DataFrame of jobs
+    """
+    return pd.read_parquet(path, engine='pyarrow', columns=columns)
+
+
+def load_jobs_from_parquet(path: str) -> List[JobRecord]:
+    """
+    Reads a Parquet export back into job records.
+
+    Args:
+        path: Parquet file
+
+    Returns:
+        List of job records
+    """
+    df = load_jobs_dataframe(path)
+    columns = [df[field].astype(object).where(df[field].notna(), None).tolist() for field in JobRecord.__slots__]
+    return [JobRecord(**dict(zip(JobRecord.__slots__, values))) for values in zip(*columns)]
@@ -0,0 +1,159 @@
+import sys
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Iterable, Union
+from models.job_details_model import JobDetailModel
+from models.job_search_model import Job, JobSearchModel
+
+
+class JobRecord:
+    """
+    Compact normalized job posting, shared by every scraper.
+
+    Records use __slots__ instead of a per-instance dict, and the highly
+    repeated company, location, contract type, remote status and source
+    values are interned, so large corpora stay small in memory.
+
+    Attributes:
+        title (str): Name of the job
+        company (str): Company of the job
+        location (str): Location of the job
+        contract_type (str): Contract type of the job
+        remote_status (str): Remote status of the job
+        posted_time (str): Posted time of the job (ISO format when known)
+        description (str): Description of the job
+        profile (str): Profil content of the job
+        required_skills (str): Required skills of the job
+        salary (str): Salary or Daily Rate of the job
+        url (str): URL of the job
+        source (str): Job board the job was scraped from
+    """
+
+    __slots__ = (
+        'title', 'company', 'location', 'contract_type', 'remote_status', 'posted_time',
+        'description', 'profile', 'required_skills', 'salary', 'url', 'source'
+    )
+
+    # Columns with few distinct values, interned in memory and dictionary-encoded in Parquet
+    CATEGORICAL_FIELDS = ('company', 'location', 'contract_type', 'remote_status', 'source')
+
+    def __init__(self, title: str, url: str, company: Optional[str] = None, location: Optional[str] = None,
+                 contract_type: Optional[str] = None, remote_status: Optional[str] = None,
+                 posted_time: Optional[str] = None, description: Optional[str] = None,
+                 profile: Optional[str] = None, required_skills: Optional[str] = None,
+                 salary: Optional[str] = None, source: Optional[str] = None):
+        self.title = title
+        self.url = url
+        self.company = _intern(company)
+        self.location = _intern(location)
+        self.contract_type = _intern(contract_type)
+        self.remote_status = _intern(remote_status)
+        self.posted_time = posted_time
+        self.description = description
+        self.profile = profile
+        self.required_skills = required_skills
+        self.salary = salary
+        self.source = _intern(source)
+
+    def __repr__(self) -> str:
+        return f"JobRecord(title={self.title!r}, company={self.company!r}, url={self.url!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, JobRecord):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in self.__slots__)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Converts the record into a dictionary.
+
+        Returns:
+            Dictionary with one key per field
+        """
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], source: Optional[str] = None) -> "JobRecord":
+        """
+        Builds a record from any scraper's job dictionary.
+
+        Both the HTML scrapers' keys (title, url, published_at, ...) and the
+        JobDetailModel keys (job_name, job_url, ...) are understood.
+
+        Args:
+            data: Job dictionary
+            source: Job board, used when the dictionary has no source
+
+        Returns:
+            The normalized record
+        """
+        def first(*keys: str) -> Optional[str]:
+            for key in keys:
+                value = data.get(key)
+                if value not in (None, ""):
+                    return _to_str(value)
+            return None
+
+        return cls(
+            title=first('title', 'job_name') or "",
+            url=first('url', 'job_url') or "",
+            company=first('company', 'job_company'),
+            location=first('location', 'job_location'),
+            contract_type=first('contract_type', 'job_contract_type'),
+            remote_status=first('remote_status', 'job_remote_status'),
+            posted_time=first('posted_time', 'published_at', 'job_posted_time'),
+            description=first('description', 'job_description'),
+            profile=first('requirements', 'job_profil_content'),
+            required_skills=first('required_skills', 'job_required_skills'),
+            salary=first('salary', 'job_salary'),
+            source=first('source') or source
+        )
+
+    @classmethod
+    def from_model(cls, model: Union[JobDetailModel, Job], source: Optional[str] = None) -> "JobRecord":
+        """
+        Builds a record from an LLM structured output.
+
+        Args:
+            model: JobDetailModel or JobSearchModel job
+            source: Job board the job comes from
+
+        Returns:
+            The normalized record
+        """
+        return cls.from_dict(model.model_dump(), source=source)
+
+
+def to_job_records(jobs: Union[JobSearchModel, Iterable[Union[Dict[str, Any], JobDetailModel, Job]]],
+                   source: Optional[str] = None) -> List[JobRecord]:
+    """
+    Converts the output of any scraper into normalized records.
+
+    Args:
+        jobs: List of job dictionaries or models, or a JobSearchModel
+        source: Job board, used when a job has no source
+
+    Returns:
+        List of normalized records
+    """
+    if isinstance(jobs, JobSearchModel):
+        jobs = jobs.jobs
+
+    records = []
+    for job in jobs:
+        if isinstance(job, JobRecord):
+            records.append(job)
+        elif isinstance(job, dict):
+            records.append(JobRecord.from_dict(job, source=source))
+        else:
+            records.append(JobRecord.from_model(job, source=source))
+    return records
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value is not None else None
+
+
+def _to_str(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
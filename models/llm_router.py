@@ -0,0 +1,381 @@
+import threading
+import time
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import List, Dict, Any, Optional
+from config import LLM_BACKENDS, LLM_ROUTES, LLM_MAX_CONCURRENCY, LLM_TOKENS_PER_MINUTE, LLM_HEDGE_AFTER_SECONDS
+from models.llm_session import LLMSession
+
+
+class ProviderLimiter:
+    """
+    Concurrency and tokens-per-minute limits shared by the backends of one provider.
+
+    Attributes:
+        max_concurrency (int): Maximum number of requests in flight, or None for no limit
+        tokens_per_minute (int): Token budget per minute, or None for no limit
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = None, tokens_per_minute: Optional[int] = None):
+        self.max_concurrency = max_concurrency
+        self.tokens_per_minute = tokens_per_minute
+        self._semaphore = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        self._lock = threading.Lock()
+        self._tokens = float(tokens_per_minute or 0)
+        self._refilled_at = time.monotonic()
+        self._in_flight = 0
+
+    def acquire(self, tokens: int) -> None:
+        """
+        Wait for a request slot and for enough tokens in the bucket.
+
+        Args:
+            tokens: Estimated tokens of the request
+        """
+        if self._semaphore:
+            self._semaphore.acquire()
+        with self._lock:
+            self._in_flight += 1
+        if not self.tokens_per_minute:
+            return
+
+        # A request larger than the whole budget only waits for a full bucket
+        tokens = min(tokens, self.tokens_per_minute)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.tokens_per_minute,
+                    self._tokens + (now - self._refilled_at) * self.tokens_per_minute / 60
+                )
+                self._refilled_at = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait_time = (tokens - self._tokens) * 60 / self.tokens_per_minute
+            time.sleep(wait_time)
+
+    def release(self) -> None:
+        """
+        Free the request slot.
+        """
+        with self._lock:
+            self._in_flight -= 1
+        if self._semaphore:
+            self._semaphore.release()
+
+    def has_capacity(self, tokens: int = 1) -> bool:
+        """
+        Tells whether a request could start right away.
+
+        Args:
+            tokens: Estimated tokens of the request
+        """
+        if self.max_concurrency and self._in_flight >= self.max_concurrency:
+            return False
+        if self.tokens_per_minute:
+            tokens = min(tokens, self.tokens_per_minute)
+            with self._lock:
+                elapsed = time.monotonic() - self._refilled_at
+                return self._tokens + elapsed * self.tokens_per_minute / 60 >= tokens
+        return True
+
+
+class LLMBackend:
+    """
+    One provider/model pair of the router, with its rolling health statistics.
+
+    Attributes:
+        name (str): Backend name, "provider:model"
+        provider (str): The LLM provider name
+        session (LLMSession): The session used to call the model
+        limiter (ProviderLimiter): Limits of the provider
+    """
+
+    # Rolling window of the last calls used for latency and error rates
+    WINDOW_SIZE = 50
+
+    def __init__(self, provider: str, model: str, limiter: ProviderLimiter, session: Optional[LLMSession] = None):
+        self.name = f"{provider}:{model}"
+        self.provider = provider
+        self.session = session or LLMSession(provider=provider, model=model)
+        self.limiter = limiter
+        self._calls = deque(maxlen=self.WINDOW_SIZE)
+        self._consecutive_errors = 0
+        self._open_until = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, ok: bool, cooldown: float) -> None:
+        """
+        Record the outcome of a call, and open the circuit of a failing backend.
+
+        Once the cooldown is over the circuit is half-open: the next call is a
+        probe, and a successful probe closes the circuit with a fresh window.
+
+        Args:
+            latency: Duration of the call in seconds
+            ok: Whether the call succeeded
+            cooldown: Seconds the backend is skipped once its circuit opens
+        """
+        with self._lock:
+            if ok and self._open_until and self.is_available():
+                # Successful probe: the errors that opened the circuit are forgotten
+                self._calls.clear()
+                self._open_until = 0.0
+            self._calls.append((latency, ok))
+            if ok:
+                self._consecutive_errors = 0
+                return
+            self._consecutive_errors += 1
+            if self._consecutive_errors >= 3 or (len(self._calls) >= 10 and self._error_rate() >= 0.5):
+                self._open_until = time.monotonic() + cooldown
+
+    def is_available(self) -> bool:
+        """
+        Tells whether the backend circuit is closed.
+        """
+        return time.monotonic() >= self._open_until
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Rolling statistics of the backend.
+
+        Returns:
+            Dictionary with the number of calls, error rate and p50/p95 latencies in the window
+        """
+        with self._lock:
+            latencies = sorted(latency for latency, ok in self._calls if ok)
+            return {
+                'calls': len(self._calls),
+                'error_rate': self._error_rate(),
+                'p50_latency': latencies[len(latencies) // 2] if latencies else None,
+                'p95_latency': latencies[int(len(latencies) * 0.95)] if latencies else None,
+                'available': self.is_available(),
+            }
+
+    def _error_rate(self) -> float:
+        if not self._calls:
+            return 0.0
+        return sum(1 for _, ok in self._calls if not ok) / len(self._calls)
+
+
+class LLMRouter:
+    """
+    Routes LLM calls across several provider/model backends.
+
+    The router has the same interface as LLMSession (invoke, search_job,
+    detail_job), so it can be given to LLMScraper instead of a single
+    session. Each task type has an ordered list of backends, preferred
+    (usually cheapest) first. Backends with an open circuit are skipped,
+    backends without free capacity or slower than slow_latency are tried
+    last, failed calls fail over to the next backend, and a request still
+    running after hedge_after seconds is duplicated on the next backend.
+
+    Attributes:
+        backends (Dict[str, LLMBackend]): Backends by name
+        routes (Dict[str, List[str]]): Ordered backend names for each task type
+        hedge_after (float): Seconds before a slow request is hedged, or None to disable hedging
+    """
+
+    TASKS = ('invoke', 'search_job', 'detail_job')
+
+    # Rough token estimate of the structured answers, added to the prompt size
+    OUTPUT_TOKENS_ESTIMATE = 1024
+
+    def __init__(self, backends: List[LLMBackend], routes: Optional[Dict[str, List[str]]] = None,
+                 hedge_after: Optional[float] = None, slow_latency: float = 30.0, cooldown: float = 60.0,
+                 max_hedges: int = 1):
+        """
+        Initialize the router.
+
+        Args:
+            backends: Backends to route to
+            routes: Ordered backend names for each task type. Tasks without a route use every backend.
+            hedge_after: Seconds before a slow request is duplicated on the next backend. None disables hedging.
+            slow_latency: Median latency (seconds) above which a backend is tried after the others
+            cooldown: Seconds a failing backend is skipped
+            max_hedges: Maximum number of duplicated requests per call
+
+        Raises:
+            Exception: If a route uses an unknown task or backend.
+        """
+        self.backends = {backend.name: backend for backend in backends}
+        self.routes = routes or {}
+        self.hedge_after = hedge_after
+        self.slow_latency = slow_latency
+        self.cooldown = cooldown
+        self.max_hedges = max_hedges
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._executor = ThreadPoolExecutor(max_workers=max(8, 4 * len(backends)))
+
+        for task, names in self.routes.items():
+            if task not in self.TASKS:
+                raise Exception(f"Invalid LLM task in routes: {task}")
+            unknown = [name for name in names if name not in self.backends]
+            if unknown:
+                raise Exception(f"Unknown LLM backends in route {task}: {unknown}")
+
+    @classmethod
+    def from_config(cls) -> "LLMRouter":
+        """
+        Build a router from the LLM_BACKENDS, LLM_ROUTES, LLM_MAX_CONCURRENCY,
+        LLM_TOKENS_PER_MINUTE and LLM_HEDGE_AFTER_SECONDS settings.
+
+        Returns:
+            The configured router
+
+        Raises:
+            Exception: If no backend is configured.
+        """
+        if not LLM_BACKENDS:
+            raise Exception("No LLM backends configured (LLM_BACKENDS)")
+
+        concurrency = _parse_limits(LLM_MAX_CONCURRENCY)
+        tokens_per_minute = _parse_limits(LLM_TOKENS_PER_MINUTE)
+
+        limiters = {}
+        backends = []
+        for name in _split(LLM_BACKENDS, ","):
+            # Ollama model names contain ":" too, the provider is before the first one
+            provider, model = name.split(":", 1)
+            if provider not in limiters:
+                limiters[provider] = ProviderLimiter(concurrency.get(provider), tokens_per_minute.get(provider))
+            backends.append(LLMBackend(provider, model, limiters[provider]))
+
+        routes = {}
+        for rule in _split(LLM_ROUTES, ";"):
+            task, names = rule.split("=", 1)
+            routes[task.strip()] = _split(names, ",")
+
+        return cls(backends, routes=routes, hedge_after=LLM_HEDGE_AFTER_SECONDS)
+
+    def invoke(self, message):
+        """Send a message to the routed LLM.
+
+        Args:
+            message (list): The input message or prompt to send to the LLM: [SystemMessage, HumanMessage].
+
+        Returns:
+            The LLM response.
+        """
+        return self._dispatch('invoke', message)
+
+    def search_job(self, message):
+        """Send a message to the routed LLM and get a structured response.
+
+        Args:
+            message (list): The input message or prompt to send to the LLM: [SystemMessage, HumanMessage].
+
+        Returns:
+            JobSearchModel: A structured response.
+        """
+        return self._dispatch('search_job', message)
+
+    def detail_job(self, message):
+        """Send a message to the routed LLM and get a structured response.
+
+        Args:
+            message (list): The input message or prompt to send to the LLM: [SystemMessage, HumanMessage].
+
+        Returns:
+            JobDetailModel: A structured response.
+        """
+        return self._dispatch('detail_job', message)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Rolling statistics of every backend.
+
+        Returns:
+            Dictionary mapping backend names to their statistics
+        """
+        return {name: backend.stats() for name, backend in self.backends.items()}
+
+    def _candidates(self, task: str, tokens: int) -> List[LLMBackend]:
+        names = self.routes.get(task) or list(self.backends)
+        backends = [self.backends[name] for name in names]
+
+        available = [backend for backend in backends if backend.is_available()]
+        if not available:
+            # Every circuit is open: trying is better than failing the crawl
+            self.logger.warning(f"All LLM backends for {task} are failing, trying them anyway")
+            available = backends
+
+        def is_slow(backend: LLMBackend) -> bool:
+            p50_latency = backend.stats()['p50_latency']
+            return p50_latency is not None and p50_latency > self.slow_latency
+
+        # Stable sort: the route order (cost preference) is kept among equivalent backends
+        return sorted(available, key=lambda backend: (not backend.limiter.has_capacity(tokens), is_slow(backend)))
+
+    def _dispatch(self, task: str, message):
+        candidates = self._candidates(task, self._estimate_tokens(message))
+        pending = {}
+        hedges = 0
+        next_index = 0
+        last_error = None
+
+        def launch() -> None:
+            nonlocal next_index
+            backend = candidates[next_index]
+            next_index += 1
+            pending[self._executor.submit(self._call, backend, task, message)] = backend
+
+        launch()
+        while pending:
+            can_hedge = self.hedge_after and hedges < self.max_hedges and next_index < len(candidates)
+            done, _ = wait(pending, timeout=self.hedge_after if can_hedge else None, return_when=FIRST_COMPLETED)
+
+            if not done:
+                hedges += 1
+                self.logger.info(f"LLM {task} slower than {self.hedge_after}s, hedging on {candidates[next_index].name}")
+                launch()
+                continue
+
+            for future in done:
+                backend = pending.pop(future)
+                try:
+                    return future.result()
+                except Exception as e:
+                    last_error = e
+                    self.logger.warning(f"LLM {task} failed on {backend.name}: {e}")
+
+            # Fail over to the next backend when nothing else is running
+            if not pending and next_index < len(candidates):
+                launch()
+
+        raise last_error
+
+    def _call(self, backend: LLMBackend, task: str, message):
+        backend.limiter.acquire(self._estimate_tokens(message))
+        start = time.monotonic()
+        try:
+            result = getattr(backend.session, task)(message)
+        except Exception:
+            backend.record(time.monotonic() - start, ok=False, cooldown=self.cooldown)
+            raise
+        finally:
+            backend.limiter.release()
+        backend.record(time.monotonic() - start, ok=True, cooldown=self.cooldown)
+        return result
+
+    def _estimate_tokens(self, message) -> int:
+        # About 4 characters per token for the prompt, plus the expected answer
+        if isinstance(message, str):
+            text_length = len(message)
+        else:
+            text_length = sum(len(str(getattr(part, 'content', part))) for part in message)
+        return text_length // 4 + self.OUTPUT_TOKENS_ESTIMATE
+
+
+def _split(value: Optional[str], separator: str) -> List[str]:
+    return [item.strip() for item in (value or "").split(separator) if item.strip()]
+
+
+def _parse_limits(value: Optional[str]) -> Dict[str, int]:
+    limits = {}
+    for item in _split(value, ","):
+        provider, limit = item.split("=", 1)
+        limits[provider.strip()] = int(limit)
+    return limits
@@ -7,10 +7,21 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
 from playwright.sync_api import sync_playwright
+import os
+import re
+import json
 import time
 import random
 import logging
-from typing import List, Dict, Any, Optional
+import urllib.parse
+from typing import List, Dict, Any, Optional, Callable, Tuple
+from databases.crawl_queue import CrawlQueue
+from scrappers.json_capture import extract_jobs_from_json
+from models.job_details_model import JobDetailModel
+from config import (
+    PLAYWRIGHT_BLOCKED_RESOURCE_TYPES, PLAYWRIGHT_BLOCKED_DOMAINS,
+    PLAYWRIGHT_ALLOWED_DOMAINS, PLAYWRIGHT_STORAGE_STATE_DIR
+)
 
 logging.basicConfig(
     level=logging.INFO,  # (DEBUG, INFO, WARNING, ERROR, CRITICAL)
@@ -23,18 +34,74 @@ class BaseScraper(ABC):
     Defines common interface and utility methods.
     """
     
-    def __init__(self, headers: Optional[Dict[str, str]] = None):
+    # CSS selector of the cookie consent button, clicked once and kept in the cached storage state
+    COOKIE_CONSENT_SELECTOR: Optional[str] = None
+    
+    # Typical transfer size of blocked resources (bytes), used to estimate the bandwidth saved
+    TYPICAL_RESOURCE_BYTES = {
+        'image': 25_000,
+        'media': 500_000,
+        'font': 30_000,
+        'stylesheet': 15_000,
+        'script': 25_000,
+        'xhr': 5_000,
+        'fetch': 5_000,
+    }
+    
+    # Network capture mode: regular expressions matching the job board API calls made by its pages
+    JSON_CAPTURE_PATTERNS: List[str] = []
+    
+    # JSON extraction mapping to JobDetailModel fields (see scrappers.json_capture.extract_jobs_from_json)
+    JSON_EXTRACTION: Optional[Dict[str, Any]] = None
+    
+    # Query string or JSON body parameter holding the page number of the API, and its offset from 1-based pages
+    JSON_API_PAGE_PARAM = 'page'
+    JSON_API_PAGE_OFFSET = 0
+    
+    # Keys of the scraper's job listings for each JobDetailModel field, so both fetch modes return the same shape
+    JSON_LISTING_KEYS = {
+        'job_name': 'title',
+        'job_company': 'company',
+        'job_location': 'location',
+        'job_contract_type': 'contract_type',
+        'job_remote_status': 'remote_status',
+        'job_posted_time': 'posted_time',
+        'job_description': 'description',
+        'job_profil_content': 'requirements',
+        'job_required_skills': 'required_skills',
+        'job_salary': 'salary',
+        'job_url': 'url',
+    }
+    
+    # Job board name written in the source field of the listings
+    SOURCE_NAME: Optional[str] = None
+    
+    def __init__(self, headers: Optional[Dict[str, str]] = None, crawl_queue: Optional[CrawlQueue] = None,
+                 lightweight: bool = True, capture_mode: bool = False):
         """
         Initialize the scraper with custom HTTP headers.
         
         Args:
             headers: HTTP headers for requests. If None, uses default headers.
+            crawl_queue: Persistent queue of crawl tasks. If None, opens the default one.
+            lightweight: Block images, fonts, stylesheets, media and trackers in Playwright fetches.
+            capture_mode: Read job listings from the board's JSON API instead of the rendered HTML.
         """
         self.headers = headers or {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
         self.session = requests.Session()
         self.logger = logging.getLogger(self.__class__.__name__)
+        self.crawl_queue = crawl_queue or CrawlQueue()
+        self.lightweight = lightweight
+        self.blocked_resource_types = set(PLAYWRIGHT_BLOCKED_RESOURCE_TYPES)
+        self.blocked_domains = PLAYWRIGHT_BLOCKED_DOMAINS
+        self.allowed_domains = PLAYWRIGHT_ALLOWED_DOMAINS
+        self.storage_state_path = os.path.join(PLAYWRIGHT_STORAGE_STATE_DIR, f"{self.__class__.__name__}.json")
+        self.capture_mode = capture_mode
+        self.json_api_cache_path = os.path.join(PLAYWRIGHT_STORAGE_STATE_DIR, f"{self.__class__.__name__}_json_api.json")
+        self.last_crawl_stats = {}
+        self.reset_fetch_stats()
         
     def get_page(self, url: str) -> Optional[str]:
         """
@@ -101,27 +168,360 @@ class BaseScraper(ABC):
     def get_dynamic_page_playwright(self, url: str, waiting_time: int = 3) -> Optional[str]:
         """
         Fetches webpage content with JavaScript rendering using Playwright.
+        
+        In lightweight mode, images, fonts, stylesheets, media and tracker
+        requests are aborted, and the browser context reuses a cached storage
+        state so cookie consent is only handled once.
+        
+        Args:
+            url: URL of the page to fetch
+            waiting_time: Seconds to wait for JavaScript to execute
+            
+        Returns:
+            The fully rendered HTML content of the page, or None if error occurs
+        """
+        try:
+            html_content, _ = self._render_with_playwright(url, waiting_time)
+            return html_content
+        except Exception as e:
+            self.logger.error(f"Error fetching dynamic content from {url}: {e}")
+            return None
+    
+    def capture_json_responses(self, url: str, url_patterns: List[str], waiting_time: int = 3) -> List[Dict[str, Any]]:
+        """
+        Loads a page with Playwright and records the JSON XHR/fetch responses it triggers.
+        
+        Args:
+            url: URL of the page to load
+            url_patterns: Regular expressions, a response is recorded if its URL matches one of them
+            waiting_time: Seconds to wait for JavaScript to execute
+            
+        Returns:
+            List of captured responses, each with the request (url, method, headers, post_data),
+            the response status and the decoded JSON body
+        """
+        try:
+            _, captured = self._render_with_playwright(url, waiting_time, url_patterns)
+            self.logger.info(f"Captured {len(captured)} JSON responses from {url}")
+            return captured
+        except Exception as e:
+            self.logger.error(f"Error capturing JSON responses from {url}: {e}")
+            return []
+    
+    def _render_with_playwright(self, url: str, waiting_time: int,
+                                capture_patterns: Optional[List[str]] = None) -> Tuple[str, List[Dict[str, Any]]]:
+        # Add random delay to avoid being blocked
+        time.sleep(random.uniform(1, 3))
+        
+        with sync_playwright() as p:
+            if self.lightweight:
+                browser = p.chromium.launch(headless=True, args=["--blink-settings=imagesEnabled=false"])
+            else:
+                browser = p.chromium.launch(headless=True)
+            
+            has_storage_state = os.path.exists(self.storage_state_path)
+            context = browser.new_context(
+                user_agent=self.headers['User-Agent'],
+                storage_state=self.storage_state_path if has_storage_state else None
+            )
+            if self.lightweight:
+                context.route("**/*", self._route_request)
+            
+            page = context.new_page()
+            page.on("requestfinished", self._record_request_size)
+            
+            responses = []
+            if capture_patterns:
+                patterns = [re.compile(pattern) for pattern in capture_patterns]
+                page.on("response", lambda response: responses.append(response)
+                        if response.request.resource_type in ('xhr', 'fetch')
+                        and any(pattern.search(response.url) for pattern in patterns) else None)
+            
+            page.goto(url)
+            
+            # A state saved without consent would skip the banner on every later fetch
+            save_storage_state = has_storage_state or not self.COOKIE_CONSENT_SELECTOR
+            if self.COOKIE_CONSENT_SELECTOR and not has_storage_state:
+                save_storage_state = self._accept_cookie_consent(page)
+            
+            # Wait for a fixed time to allow JavaScript to execute
+            time.sleep(waiting_time)
+            
+            # Get the HTML content
+            html_content = page.content()
+            
+            # Response bodies must be read before the browser is closed
+            captured = []
+            for response in responses:
+                try:
+                    captured.append({
+                        'url': response.url,
+                        'method': response.request.method,
+                        'headers': response.request.headers,
+                        'post_data': response.request.post_data,
+                        'status': response.status,
+                        'json': response.json()
+                    })
+                except Exception as e:
+                    self.logger.debug(f"Skipping non JSON response {response.url}: {e}")
+            
+            if save_storage_state:
+                os.makedirs(os.path.dirname(self.storage_state_path) or ".", exist_ok=True)
+                context.storage_state(path=self.storage_state_path)
+            
+            browser.close()
+            self.fetch_stats['pages'] += 1
+            return html_content, captured
+    
+    def discover_json_api(self, search_url: str, refresh: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Finds the JSON API request behind a search page.
+        
+        The page is rendered once in capture mode, and the first captured
+        response the JSON extraction mapping can read jobs from is kept as the
+        endpoint. Endpoints are cached on disk per search URL, so later runs
+        skip rendering entirely.
+        
+        Args:
+            search_url: URL of the first search result page
+            refresh: Ignore the cached endpoint and capture it again
+            
+        Returns:
+            The endpoint request (url, method, headers, post_data), or None if not found
+        """
+        cache = {}
+        if os.path.exists(self.json_api_cache_path):
+            with open(self.json_api_cache_path, encoding='utf-8') as f:
+                cache = json.load(f)
+        
+        if not refresh and search_url in cache:
+            return cache[search_url]
+        
+        if not self.JSON_CAPTURE_PATTERNS or not self.JSON_EXTRACTION:
+            self.logger.warning("No JSON capture patterns or extraction mapping declared")
+            return None
+        
+        for response in self.capture_json_responses(search_url, self.JSON_CAPTURE_PATTERNS):
+            if response['status'] != 200 or not extract_jobs_from_json(response['json'], self.JSON_EXTRACTION):
+                continue
+            
+            headers = {k: v for k, v in response['headers'].items()
+                       if k.lower() not in ('host', 'content-length', 'cookie') and not k.startswith(':')}
+            endpoint = {
+                'url': response['url'],
+                'method': response['method'],
+                'headers': headers,
+                'post_data': response['post_data']
+            }
+            cache[search_url] = endpoint
+            os.makedirs(os.path.dirname(self.json_api_cache_path) or ".", exist_ok=True)
+            with open(self.json_api_cache_path, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, indent=2)
+            
+            self.logger.info(f"JSON API endpoint found: {endpoint['method']} {endpoint['url']}")
+            return endpoint
+        
+        self.logger.warning(f"No JSON API response with jobs captured from {search_url}")
+        return None
+    
+    def build_json_api_request(self, endpoint: Dict[str, Any], page: int) -> Dict[str, Any]:
+        """
+        Builds the API request of a result page from the captured endpoint.
+        
+        The JSON_API_PAGE_PARAM is set in the query string, and at the top
+        level of a JSON body if present. Scrapers override this method when
+        their API pages differently.
+        
+        Args:
+            endpoint: Captured endpoint request
+            page: Result page number (1-based)
+            
+        Returns:
+            Dictionary with the method, url and data of the request
+        """
+        api_page = page + self.JSON_API_PAGE_OFFSET
+        
+        parsed_url = urllib.parse.urlparse(endpoint['url'])
+        query = dict(urllib.parse.parse_qsl(parsed_url.query, keep_blank_values=True))
+        data = endpoint.get('post_data')
+        
+        body = None
+        if data:
+            try:
+                body = json.loads(data)
+            except ValueError:
+                body = None
+        
+        if isinstance(body, dict) and self.JSON_API_PAGE_PARAM in body:
+            body[self.JSON_API_PAGE_PARAM] = api_page
+            data = json.dumps(body)
+        else:
+            query[self.JSON_API_PAGE_PARAM] = str(api_page)
+        
+        return {
+            'method': endpoint['method'],
+            'url': parsed_url._replace(query=urllib.parse.urlencode(query)).geturl(),
+            'data': data
+        }
+    
+    def fetch_json_api_page(self, endpoint: Dict[str, Any], page: int) -> Optional[Any]:
+        """
+        Fetches a result page directly from the JSON API with plain HTTP.
+        
+        Args:
+            endpoint: Captured endpoint request
+            page: Result page number (1-based)
+            
+        Returns:
+            The decoded JSON response, or None if error occurs
         """
+        request = self.build_json_api_request(endpoint, page)
         try:
             # Add random delay to avoid being blocked
             time.sleep(random.uniform(1, 3))
             
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
-                page = browser.new_page(user_agent=self.headers['User-Agent'])
-                page.goto(url)
-                
-                # Wait for a fixed time to allow JavaScript to execute
-                time.sleep(waiting_time)
-                
-                # Get the HTML content
-                html_content = page.content()
-                
-                browser.close()
-                return html_content
-        except Exception as e:
-            self.logger.error(f"Error fetching dynamic content from {url}: {e}")
+            response = self.session.request(
+                request['method'], request['url'],
+                headers={**endpoint.get('headers', {}), 'User-Agent': self.headers['User-Agent']},
+                data=request['data']
+            )
+            response.raise_for_status()
+            return response.json()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            self.logger.error(f"Error fetching JSON API page {page} from {request['url']}: {e}")
+            return None
+    
+    def search_jobs_with_json_api(self, search_url: str, num_pages: int = 1) -> Optional[List[Dict[str, Any]]]:
+        """
+        Searches for job listings through the board's JSON API, without rendering nor LLM calls.
+        
+        The first page is read before the other pages are queued. When the
+        cached endpoint cannot answer it (expired signature, rotated API key,
+        ...), the endpoint is captured again right away instead of after the
+        queue retries, and the pages are fetched from the new one.
+        
+        Args:
+            search_url: URL of the first search result page, used to discover the API
+            num_pages: Number of result pages to fetch
+            
+        Returns:
+            List of job listings with the same keys as the HTML scraping (see JSON_LISTING_KEYS),
+            or None if no working API endpoint was found
+        """
+        self.reset_fetch_stats()
+        run_id = self.start_run('json_api', search_url, num_pages)
+        endpoint = self.discover_json_api(search_url)
+        
+        # A resumed run that already read the first page keeps going with the cached endpoint
+        first_page = None
+        if endpoint and not any(page['page'] == 1 for page in self.crawl_queue.results(run_id, 'api')):
+            first_page = self.fetch_json_api_page(endpoint, 1)
+            if first_page is None:
+                self.logger.warning(f"JSON API endpoint {endpoint['url']} did not answer the first page, capturing it again")
+                endpoint = self.discover_json_api(search_url, refresh=True)
+                first_page = self.fetch_json_api_page(endpoint, 1) if endpoint else None
+                # Pages left by a previous attempt used the stale endpoint
+                self.crawl_queue.clear_run(run_id)
+                self.crawl_queue.start_run(run_id)
+            if first_page is None:
+                endpoint = None
+        
+        if not endpoint:
+            self.crawl_queue.clear_run(run_id)
+            return None
+        
+        for page in range(1, num_pages + 1):
+            self.crawl_queue.enqueue(run_id, 'api', f"{endpoint['url']}#page={page}", {'page': page})
+        self.process_queue(run_id, {'api': lambda task: self._process_json_api_page(endpoint, task, first_page)})
+        
+        jobs = [job for page in self.crawl_queue.results(run_id, 'api') for job in page['jobs']]
+        self.finish_run(run_id)
+        return jobs
+    
+    def _process_json_api_page(self, endpoint: Dict[str, Any], task: Dict[str, Any],
+                               first_page: Optional[Any] = None) -> Optional[Dict[str, Any]]:
+        # The first page may already have been fetched to check the endpoint
+        page = task['payload']['page']
+        self.logger.info(f"Reading API page {page}")
+        payload = first_page if page == 1 and first_page is not None else self.fetch_json_api_page(endpoint, page)
+        if payload is None:
             return None
+        jobs = extract_jobs_from_json(payload, self.JSON_EXTRACTION)
+        return {'page': page, 'jobs': [self._json_job_to_listing(job) for job in jobs]}
+    
+    def _json_job_to_listing(self, job: JobDetailModel) -> Dict[str, Any]:
+        listing = {self.JSON_LISTING_KEYS[field]: value for field, value in job.model_dump().items()
+                   if field in self.JSON_LISTING_KEYS}
+        listing['source'] = self.SOURCE_NAME
+        return listing
+    
+    def should_block_request(self, url: str, resource_type: str) -> bool:
+        """
+        Tells whether a browser request is blocked in lightweight mode.
+        
+        Allowed domains always go through. Otherwise, blocked resource types
+        and requests to blocked (tracker) domains are aborted.
+        
+        Args:
+            url: URL of the request
+            resource_type: Playwright resource type (image, font, script, ...)
+            
+        Returns:
+            True if the request must be aborted
+        """
+        host = urllib.parse.urlparse(url).hostname or ""
+        
+        if any(self._host_matches(host, domain) for domain in self.allowed_domains):
+            return False
+        if resource_type in self.blocked_resource_types:
+            return True
+        return any(self._host_matches(host, domain) for domain in self.blocked_domains)
+    
+    def reset_fetch_stats(self) -> None:
+        """
+        Resets the Playwright bandwidth counters.
+        
+        Public searches call this first, so the counters reported by finish_run
+        cover every render of the search (API discovery included).
+        """
+        self.fetch_stats = {
+            'pages': 0,
+            'requests_blocked': 0,
+            'blocked_by_type': {},
+            'bytes_loaded': 0,
+            'bytes_saved_estimate': 0,
+        }
+    
+    def _route_request(self, route) -> None:
+        request = route.request
+        if self.should_block_request(request.url, request.resource_type):
+            self.fetch_stats['requests_blocked'] += 1
+            blocked_by_type = self.fetch_stats['blocked_by_type']
+            blocked_by_type[request.resource_type] = blocked_by_type.get(request.resource_type, 0) + 1
+            self.fetch_stats['bytes_saved_estimate'] += self.TYPICAL_RESOURCE_BYTES.get(request.resource_type, 0)
+            route.abort()
+        else:
+            route.continue_()
+    
+    def _record_request_size(self, request) -> None:
+        # Transferred sizes, also counted for chunked and compressed responses without content-length
+        try:
+            sizes = request.sizes()
+            self.fetch_stats['bytes_loaded'] += sizes['responseHeadersSize'] + sizes['responseBodySize']
+        except Exception as e:
+            self.logger.debug(f"No response size for {request.url}: {e}")
+    
+    def _accept_cookie_consent(self, page) -> bool:
+        try:
+            page.click(self.COOKIE_CONSENT_SELECTOR, timeout=5000)
+            return True
+        except Exception as e:
+            self.logger.warning(f"Cookie consent button not found, browser state not saved: {e}")
+            return False
+    
+    @staticmethod
+    def _host_matches(host: str, domain: str) -> bool:
+        return host == domain or host.endswith(f".{domain}")
     
     def parse_html(self, html: Optional[str]) -> Optional[BeautifulSoup]:
         """
@@ -165,6 +565,119 @@ class BaseScraper(ABC):
         """
         pass
     
+    def get_run_id(self, *criteria: Any) -> str:
+        """
+        Builds the crawl queue run identifier of a search.
+        
+        The same scraper with the same criteria gets the same identifier,
+        which is what lets an interrupted search resume.
+        
+        Args:
+            criteria: Search criteria (keywords, location, base URL, ...)
+            
+        Returns:
+            Run identifier
+        """
+        return "|".join([self.__class__.__name__] + [str(c) for c in criteria])
+    
+    def start_run(self, *criteria: Any) -> str:
+        """
+        Opens the crawl run of a search, resuming it when a recent run with the
+        same criteria was left unfinished (see CrawlQueue.start_run).
+        
+        Args:
+            criteria: Search criteria (keywords, location, base URL, ...)
+            
+        Returns:
+            Run identifier
+        """
+        run_id = self.get_run_id(*criteria)
+        if self.crawl_queue.start_run(run_id):
+            self.logger.info(f"Resuming crawl run {run_id}: {self.crawl_queue.stats(run_id)}")
+        return run_id
+    
+    def process_queue(self, run_id: str, handlers: Dict[str, Callable[[Dict[str, Any]], Any]]) -> Dict[str, int]:
+        """
+        Leases and runs the tasks of a run until none is left.
+        
+        A handler receives the task and returns its result, or None when the
+        attempt failed and should be retried. Handlers may enqueue new tasks.
+        Failed attempts are retried after the queue backoff delay. Tasks leased
+        by a crashed process become available again when their lease expires,
+        while the leases of another process working on the same run are kept.
+        
+        Args:
+            run_id: Crawl run identifier
+            handlers: Task handler for each task kind
+            
+        Returns:
+            Number of tasks of the run by state
+        """
+        while True:
+            task = self.crawl_queue.lease(run_id)
+            if task is None:
+                retry_at = self.crawl_queue.next_retry_at(run_id)
+                if retry_at is None:
+                    break
+                # Only delayed retries are left: wait for the first one
+                time.sleep(max(0.0, retry_at - time.time()))
+                continue
+            
+            error = None
+            try:
+                result = handlers[task['kind']](task)
+            except Exception as e:
+                self.logger.error(f"Error processing {task['kind']} task {task['url']}: {e}")
+                result = None
+                error = str(e)
+            
+            if result is None:
+                self.crawl_queue.fail(task['id'], error)
+            else:
+                self.crawl_queue.complete(task['id'], result)
+        
+        stats = self.crawl_queue.stats(run_id)
+        self.logger.info(f"Crawl run {run_id} finished: {stats}")
+        return stats
+    
+    def finish_run(self, run_id: str) -> Dict[str, int]:
+        """
+        Closes a crawl run once its results have been read.
+        
+        A run whose tasks all completed is cleared, so the next search with
+        the same criteria starts fresh. A run with failed or unfinished tasks
+        is kept: its results are partial, and the next search with the same
+        criteria within the queue resume window resumes it and retries the
+        failed tasks only. Later searches start over.
+        
+        Args:
+            run_id: Crawl run identifier
+            
+        The Playwright fetch counters of the whole search (see reset_fetch_stats)
+        are logged and kept in last_crawl_stats under "fetch".
+        
+        Returns:
+            Number of tasks of the run by state, also kept in last_crawl_stats
+        """
+        stats = self.crawl_queue.stats(run_id)
+        self.last_crawl_stats = {**stats, 'fetch': dict(self.fetch_stats)}
+        if self.fetch_stats['pages']:
+            self.logger.info(
+                f"Playwright fetches: {self.fetch_stats['pages']} pages, "
+                f"{self.fetch_stats['bytes_loaded']} bytes loaded, "
+                f"{self.fetch_stats['requests_blocked']} requests blocked {self.fetch_stats['blocked_by_type']}, "
+                f"~{self.fetch_stats['bytes_saved_estimate']} bytes saved"
+            )
+        unfinished = stats[CrawlQueue.FAILED] + stats[CrawlQueue.PENDING] + stats[CrawlQueue.LEASED]
+        if unfinished:
+            self.logger.warning(
+                f"Partial results for crawl run {run_id}: {unfinished} tasks not done {stats}, "
+                f"the run is kept to be resumed"
+            )
+        else:
+            self.crawl_queue.clear_run(run_id)
+        return stats
+    
     def clean_text(self, text: Optional[str]) -> str:
         """
         Cleans text by removing extra spaces and special characters.
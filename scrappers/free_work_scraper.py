@@ -1,6 +1,8 @@
 from typing import List, Dict, Any, Optional
 from datetime import datetime
+from bs4 import BeautifulSoup
 from scrappers.base_scraper import BaseScraper
+from databases.crawl_queue import CrawlQueue
 import re
 import urllib.parse
 
@@ -11,9 +13,32 @@ class FreeWorkScraper(BaseScraper):
     
     BASE_URL = "https://www.free-work.com/"
     SEARCH_URL = f"{BASE_URL}/fr/tech-it/jobs"
+    SOURCE_NAME = 'freework'
 
-    def __init__(self):
-        super().__init__()
+    # Job listings are served by the API Platform job postings collection
+    JSON_CAPTURE_PATTERNS = [r"/api/job_postings\?"]
+    JSON_EXTRACTION = {
+        'items': 'hydra:member',
+        'fields': {
+            'job_name': 'title',
+            'job_company': 'company.name',
+            'job_location': 'location.label',
+            'job_contract_type': 'contracts',
+            'job_remote_status': 'remoteMode',
+            'job_posted_time': 'publishedAt',
+            'job_description': 'description',
+            'job_profil_content': 'candidateProfile',
+            'job_required_skills': lambda item: [skill.get('name') for skill in item.get('skills') or []],
+            'job_salary': 'salary',
+            'job_url': lambda item: f"https://www.free-work.com/fr/tech-it/"
+                                    f"{(item.get('job') or {}).get('slug')}/job-mission/{item.get('slug')}"
+        }
+    }
+
+    JSON_LISTING_KEYS = {**BaseScraper.JSON_LISTING_KEYS, 'job_posted_time': 'published_at'}
+
+    def __init__(self, crawl_queue: Optional[CrawlQueue] = None, lightweight: bool = True, capture_mode: bool = False):
+        super().__init__(crawl_queue=crawl_queue, lightweight=lightweight, capture_mode=capture_mode)
 
     def search_jobs(self, keywords: str, location: str, num_pages: int = 1) -> List[Dict[str, Any]]:
         """
@@ -25,9 +50,19 @@ class FreeWorkScraper(BaseScraper):
             num_pages: Number of pages to scrape
             
         Returns:
-            List of job listings
+            List of job listings (title, company, location, url, contract_type, salary,
+            published_at, source). In capture mode, the description and remote status
+            read from the API are filled too.
         """
-        jobs = []
+        self.reset_fetch_stats()
+        if self.capture_mode:
+            search_url = f"{self.SEARCH_URL}?{urllib.parse.urlencode({'query': keywords, 'page': 1})}"
+            jobs = self.search_jobs_with_json_api(search_url, num_pages)
+            if jobs is not None:
+                return jobs
+            self.logger.warning("JSON API not available, falling back to HTML scraping")
+
+        run_id = self.start_run(keywords, location, num_pages)
         
         for page in range(1, num_pages + 1):
             params = {
@@ -36,44 +71,75 @@ class FreeWorkScraper(BaseScraper):
             }
             
             url = f"{self.SEARCH_URL}?{urllib.parse.urlencode(params)}"
-            soup = self._fetch_page(url)
+            self.crawl_queue.enqueue(run_id, 'listing', url, {'page': page})
+
+        self.process_queue(run_id, {'listing': self._process_listing_page})
+
+        jobs = [job for page_jobs in self.crawl_queue.results(run_id, 'listing') for job in page_jobs]
+        self.finish_run(run_id)
+        return jobs
+
+    def _fetch_page(self, url: str) -> Optional[BeautifulSoup]:
+        """
+        Fetch and parse a Free-Work page. Pages are rendered server side, a plain HTTP request is enough.
+        
+        Args:
+            url: URL of the page
+            
+        Returns:
+            Parsed page, or None if the page could not be fetched
+        """
+        return self.parse_html(self.get_page(url))
+    
+    def _process_listing_page(self, task: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Parse one search result page.
+        
+        Args:
+            task: Listing task leased from the crawl queue
+            
+        Returns:
+            Job listings of the page, or None if the page could not be fetched
+        """
+        jobs = []
+        soup = self._fetch_page(task['url'])
+        
+        if not soup:
+            return None
             
-            if not soup:
+        job_cards = soup.find_all('div', {'data-v-798f5146': True, 'class': 'mb-4 relative flex'})
+        
+        for card in job_cards:
+            try:
+                title = card.find('h2', {'data-highlightable': True}).text.strip()
+                company = card.find('div', {'data-highlightable': True}).text.strip()
+                location_el = card.find('span', text='Lieu').find_next('span')
+                location = location_el.text.strip() if location_el else ''
+                
+                job_url = self.BASE_URL.rstrip('/') + card.find('a')['href']
+                
+                contract_type = "Freelance"  # Based on the tag class 'bg-contractor'
+                
+                # Extract additional information from the right column
+                info_col = card.find('div', {'class': 'lg:w-64'})
+                salary = info_col.find('span', text='TJM').find_next('span').text.strip() if info_col.find('span', text='TJM') else None
+                
+                job = {
+                    'title': title,
+                    'company': company,
+                    'location': location,
+                    'url': job_url,
+                    'contract_type': contract_type,
+                    'salary': salary,
+                    'published_at': None,  # Not visible in search results
+                    'source': self.SOURCE_NAME
+                }
+                
+                jobs.append(job)
+            except Exception as e:
+                print(f"Error parsing job card: {e}")
                 continue
                 
-            job_cards = soup.find_all('div', {'data-v-798f5146': True, 'class': 'mb-4 relative flex'})
-            
-            for card in job_cards:
-                try:
-                    title = card.find('h2', {'data-highlightable': True}).text.strip()
-                    company = card.find('div', {'data-highlightable': True}).text.strip()
-                    location_el = card.find('span', text='Lieu').find_next('span')
-                    location = location_el.text.strip() if location_el else ''
-                    
-                    job_url = self.BASE_URL.rstrip('/') + card.find('a')['href']
-                    
-                    contract_type = "Freelance"  # Based on the tag class 'bg-contractor'
-                    
-                    # Extract additional information from the right column
-                    info_col = card.find('div', {'class': 'lg:w-64'})
-                    salary = info_col.find('span', text='TJM').find_next('span').text.strip() if info_col.find('span', text='TJM') else None
-                    
-                    job = {
-                        'title': title,
-                        'company': company,
-                        'location': location,
-                        'url': job_url,
-                        'contract_type': contract_type,
-                        'salary': salary,
-                        'published_at': None,  # Not visible in search results
-                        'source': 'freework'
-                    }
-                    
-                    jobs.append(job)
-                except Exception as e:
-                    print(f"Error parsing job card: {e}")
-                    continue
-                    
         return jobs
     
     def get_job_details(self, job_url: str) -> Optional[Dict[str, Any]]:
@@ -127,7 +193,7 @@ class FreeWorkScraper(BaseScraper):
                 'requirements': requirements,
                 'published_at': published_at,
                 'url': job_url,
-                'source': 'freework'
+                'source': self.SOURCE_NAME
             }
             
         except Exception as e:
@@ -0,0 +1,78 @@
+from typing import List, Dict, Any, Callable, Union
+import logging
+from pydantic import ValidationError
+from models.job_details_model import JobDetailModel
+
+logger = logging.getLogger(__name__)
+
+# A field of a JSON extraction mapping is either a dotted path ("organization.name",
+# "offices.0.city") or a function receiving the JSON item
+JsonField = Union[str, Callable[[Dict[str, Any]], Any]]
+
+
+def get_json_path(data: Any, path: str, default: Any = None) -> Any:
+    """
+    Reads a value from nested JSON data with a dotted path.
+
+    Args:
+        data: Decoded JSON (dicts and lists)
+        path: Dotted path, list items are addressed by their index (e.g. "offices.0.city")
+        default: Value returned when the path does not exist
+
+    Returns:
+        The value at the path, or default
+    """
+    current = data
+    for key in path.split('.') if path else []:
+        if isinstance(current, dict):
+            if key not in current:
+                return default
+            current = current[key]
+        elif isinstance(current, list) and key.lstrip('-').isdigit():
+            index = int(key)
+            if not -len(current) <= index < len(current):
+                return default
+            current = current[index]
+        else:
+            return default
+    return current
+
+
+def extract_jobs_from_json(payload: Any, mapping: Dict[str, Any]) -> List[JobDetailModel]:
+    """
+    Converts a job board JSON payload into JobDetailModel objects.
+
+    The mapping has an "items" dotted path to the list of jobs in the payload
+    and a "fields" dictionary mapping JobDetailModel fields to JSON fields.
+    Lists are joined with ", " and missing required fields become empty strings.
+
+    Args:
+        payload: Decoded JSON response
+        mapping: JSON extraction mapping
+
+    Returns:
+        List of extracted jobs
+    """
+    items = get_json_path(payload, mapping.get('items', ''), default=[])
+    if not isinstance(items, list):
+        logger.warning(f"JSON path {mapping.get('items')} is not a list")
+        return []
+
+    jobs = []
+    for item in items:
+        values = {}
+        for field, source in mapping['fields'].items():
+            value = source(item) if callable(source) else get_json_path(item, source)
+            if isinstance(value, list):
+                value = ", ".join(str(v) for v in value if v is not None)
+            values[field] = str(value) if value is not None else None
+
+        for field, info in JobDetailModel.model_fields.items():
+            if info.is_required() and values.get(field) is None:
+                values[field] = ""
+
+        try:
+            jobs.append(JobDetailModel(**values))
+        except ValidationError as e:
+            logger.error(f"Error mapping JSON job: {e}")
+    return jobs
@@ -2,6 +2,7 @@ from typing import List, Dict, Any, Optional
 import urllib.parse
 from langchain.schema import SystemMessage, HumanMessage
 from scrappers.base_scraper import BaseScraper
+from databases.crawl_queue import CrawlQueue
 from templates.prompts import JOB_SEARCH_SYSTEM_PROMPT, JOB_SEARCH_HUMAN_PROMPT
 
 class LLMScraper(BaseScraper):
@@ -9,8 +10,8 @@ class LLMScraper(BaseScraper):
     Automatic Scraper implementation with LLM.
     """
 
-    def __init__(self, llm_session):
-        super().__init__()
+    def __init__(self, llm_session, crawl_queue: Optional[CrawlQueue] = None, lightweight: bool = True):
+        super().__init__(crawl_queue=crawl_queue, lightweight=lightweight)
         self.llm_session = llm_session
 
     def get_base_url(self, url):
@@ -28,38 +29,61 @@ class LLMScraper(BaseScraper):
 
     def search_jobs_with_llm(self, base_url: str, num_pages: int = 1, examples: list = []) -> List[Dict[str, Any]]:
         # TODO : Write docstring
-        jobs = []
+        self.reset_fetch_stats()
+        run_id = self.start_run(base_url, num_pages)
 
         for page in range(1, num_pages + 1):
             search_url = base_url.format(num_page=page)
             # search_url = urllib.parse.urlencode(search_url).replace('+', '%20')
+            self.crawl_queue.enqueue(run_id, 'listing', search_url, {'page': page})
 
-            self.logger.info(f"Reading page {page}: {search_url}")
-            html_content = self.get_dynamic_page_playwright(search_url, waiting_time=5)
-            # html_content = self.get_dynamic_page_selenium(search_url, waiting_time=3)
+        # Completed pages keep their LLM answer in the queue, a resumed run does not pay for them again
+        self.process_queue(run_id, {
+            'listing': lambda task: self._search_page_with_llm(task, base_url, examples)
+        })
 
-            if not html_content:
-                continue
+        jobs = [job for page_jobs in self.crawl_queue.results(run_id, 'listing') for job in page_jobs['jobs']]
+        self.finish_run(run_id)
+        # TODO get details
 
-            soup = self.parse_html(html_content)
-            if not soup:
-                continue
-            body = soup.body
+        print(jobs)
+        return jobs
 
-            input_messages = [
-                SystemMessage(content=JOB_SEARCH_SYSTEM_PROMPT),
-                HumanMessage(content=JOB_SEARCH_HUMAN_PROMPT.format(
-                    base_url = self.get_base_url(base_url), 
-                    html_content = body, 
-                    job_url_examples = "; ".join(examples)
-                    ))
-            ]
+    def _search_page_with_llm(self, task: Dict[str, Any], base_url: str, examples: list) -> Optional[Dict[str, Any]]:
+        """
+        Extract the job listings of one search result page with the LLM.
 
-            jobs = self.llm_session.search_job(input_messages)
-            # TODO get details
+        Args:
+            task: Listing task leased from the crawl queue
+            base_url: Search URL template, used to build full job URLs
+            examples: Examples of expected job URLs
 
-        print(jobs)
-        return jobs
+        Returns:
+            JobSearchModel dump of the page, or None if the page could not be fetched
+        """
+        search_url = task['url']
+        self.logger.info(f"Reading page {task['payload']['page']}: {search_url}")
+        html_content = self.get_dynamic_page_playwright(search_url, waiting_time=5)
+        # html_content = self.get_dynamic_page_selenium(search_url, waiting_time=3)
+
+        if not html_content:
+            return None
+
+        soup = self.parse_html(html_content)
+        if not soup:
+            return None
+        body = soup.body
+
+        input_messages = [
+            SystemMessage(content=JOB_SEARCH_SYSTEM_PROMPT),
+            HumanMessage(content=JOB_SEARCH_HUMAN_PROMPT.format(
+                base_url = self.get_base_url(base_url), 
+                html_content = body, 
+                job_url_examples = "; ".join(examples)
+                ))
+        ]
+
+        return self.llm_session.search_job(input_messages).model_dump()
 
     def get_job_details_with_llm(self, job_url: str) -> Optional[Dict[str, Any]]:
         # TODO : Write docstring
@@ -0,0 +1,439 @@
+import math
+import sqlite3
+import threading
+import time
+import logging
+from typing import List, Dict, Any, Optional, Callable
+from config import (
+    SCHEDULER_DB_PATH, SCHEDULER_FETCHES_PER_HOUR, SCHEDULER_LLM_TOKENS_PER_HOUR,
+    SCHEDULER_MIN_INTERVAL_MINUTES, SCHEDULER_MAX_INTERVAL_MINUTES, SCHEDULER_MAX_PAGES
+)
+
+
+def default_boards() -> Dict[str, Dict[str, Any]]:
+    """
+    Board definitions of the HTML scrapers.
+
+    A board has a "search" function (keywords, location, num_pages) -> jobs,
+    tells whether its search "uses_location", and gives the estimated
+    "fetches_per_page" and LLM "tokens_per_page" of a result page. An
+    optional "crawl_stats" function returns the task counts of the last
+    search, so a partial crawl is not mistaken for a quiet board.
+
+    These HTML boards make no LLM call, so their tokens_per_page is 0 and
+    the LLM token budget only limits boards added with an LLM-backed search
+    (e.g. LLMScraper.search_jobs_with_llm).
+
+    Returns:
+        Dictionary of board definitions by board name
+    """
+    from scrappers.welcome_to_the_jungle_scraper import WelcomeToTheJungleScraper
+    from scrappers.free_work_scraper import FreeWorkScraper
+
+    welcome_to_the_jungle = WelcomeToTheJungleScraper()
+    free_work = FreeWorkScraper()
+
+    return {
+        'welcome_to_the_jungle': {
+            'search': welcome_to_the_jungle.search_jobs,
+            'uses_location': True,
+            # One listing page and one detail page per job card
+            'fetches_per_page': 31,
+            'tokens_per_page': 0,
+            'crawl_stats': lambda: welcome_to_the_jungle.last_crawl_stats,
+        },
+        'free_work': {
+            'search': free_work.search_jobs,
+            'uses_location': False,
+            'fetches_per_page': 1,
+            'tokens_per_page': 0,
+            'crawl_stats': lambda: free_work.last_crawl_stats,
+        },
+    }
+
+
+class RefreshScheduler:
+    """
+    Long-running scheduler refreshing saved job searches adaptively.
+
+    Each saved search (board, keywords, location) learns its rate of new
+    postings from previous runs. Quiet searches are refreshed less often,
+    busy searches more often and deeper. Due searches that would fetch the
+    same pages are coalesced into a single fetch, and runs are ordered by
+    expected new jobs per fetch so the hourly fetch and LLM token budgets
+    go to the searches that actually produce new jobs.
+
+    Attributes:
+        db_path (str): Path of the SQLite database holding searches, seen jobs and budget usage
+        boards (Dict[str, Dict[str, Any]]): Board definitions, see default_boards()
+        fetches_per_hour (int): Global page fetch budget per hour
+        llm_tokens_per_hour (int): Global LLM token budget per hour
+    """
+
+    # Smoothing factor of the new postings rate
+    RATE_SMOOTHING = 0.3
+
+    # A search is refreshed when about this fraction of a result page of new jobs is expected
+    TARGET_PAGE_FILL = 0.5
+
+    # Extra depth crawled over the expected number of new jobs
+    DEPTH_MARGIN = 1.5
+
+    # A run where at least this fraction of the jobs is new probably missed jobs deeper in the results
+    SATURATION_RATIO = 0.9
+
+    # Delay before searches deferred for lack of budget are considered again
+    BUDGET_RETRY_SECONDS = 300
+
+    def __init__(self, boards: Optional[Dict[str, Dict[str, Any]]] = None, db_path: str = SCHEDULER_DB_PATH,
+                 fetches_per_hour: int = SCHEDULER_FETCHES_PER_HOUR,
+                 llm_tokens_per_hour: int = SCHEDULER_LLM_TOKENS_PER_HOUR,
+                 min_interval: float = SCHEDULER_MIN_INTERVAL_MINUTES * 60,
+                 max_interval: float = SCHEDULER_MAX_INTERVAL_MINUTES * 60,
+                 max_pages: int = SCHEDULER_MAX_PAGES,
+                 on_new_jobs: Optional[Callable[[str, List[Dict[str, Any]]], None]] = None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            boards: Board definitions. If None, uses default_boards().
+            db_path: Path of the SQLite database file
+            fetches_per_hour: Global page fetch budget per hour
+            llm_tokens_per_hour: Global LLM token budget per hour
+            min_interval: Shortest refresh interval in seconds
+            max_interval: Longest refresh interval in seconds
+            max_pages: Deepest number of result pages per run
+            on_new_jobs: Called with the board name and the new jobs of each fetch
+                (e.g. to add them to the ui search index)
+        """
+        self.boards = boards if boards is not None else default_boards()
+        self.db_path = db_path
+        self.fetches_per_hour = fetches_per_hour
+        self.llm_tokens_per_hour = llm_tokens_per_hour
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.max_pages = max_pages
+        self.on_new_jobs = on_new_jobs
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS saved_searches (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                board TEXT NOT NULL,
+                keywords TEXT NOT NULL,
+                location TEXT NOT NULL DEFAULT '',
+                enabled INTEGER NOT NULL DEFAULT 1,
+                interval_seconds REAL NOT NULL,
+                num_pages INTEGER NOT NULL DEFAULT 1,
+                new_per_hour REAL,
+                jobs_per_page REAL,
+                runs INTEGER NOT NULL DEFAULT 0,
+                last_run REAL,
+                next_run REAL NOT NULL,
+                UNIQUE (board, keywords, location)
+            );
+            CREATE TABLE IF NOT EXISTS seen_jobs (
+                board TEXT NOT NULL,
+                url TEXT NOT NULL,
+                first_seen REAL NOT NULL,
+                PRIMARY KEY (board, url)
+            );
+            CREATE TABLE IF NOT EXISTS budget_usage (
+                spent_at REAL NOT NULL,
+                fetches INTEGER NOT NULL,
+                llm_tokens INTEGER NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+
+    def add_search(self, board: str, keywords: str, location: str = "") -> int:
+        """
+        Save a search, due immediately. Saving an existing search enables it again.
+
+        Args:
+            board: Board name
+            keywords: Search keywords
+            location: Target location
+
+        Returns:
+            Identifier of the saved search
+
+        Raises:
+            Exception: If the board is unknown.
+        """
+        if board not in self.boards:
+            raise Exception(f"Unknown job board: {board}")
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO saved_searches (board, keywords, location, interval_seconds, next_run)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (board, keywords, location) DO UPDATE SET enabled = 1
+                """,
+                (board, keywords, location or "", self.min_interval, time.time())
+            )
+            row = self._conn.execute(
+                "SELECT id FROM saved_searches WHERE board = ? AND keywords = ? AND location = ?",
+                (board, keywords, location or "")
+            ).fetchone()
+        return row['id']
+
+    def remove_search(self, search_id: int) -> None:
+        """
+        Disable a saved search, keeping what it learned.
+
+        Args:
+            search_id: Identifier of the saved search
+        """
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE saved_searches SET enabled = 0 WHERE id = ?", (search_id,))
+
+    def list_searches(self) -> List[Dict[str, Any]]:
+        """
+        Get the saved searches with their learned schedule.
+
+        Returns:
+            List of saved searches
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM saved_searches ORDER BY next_run").fetchall()
+        return [dict(row) for row in rows]
+
+    def run_forever(self, poll_seconds: float = 60) -> None:
+        """
+        Refresh due searches until stop() is called.
+
+        Args:
+            poll_seconds: Longest sleep between two scheduling rounds
+        """
+        self.logger.info("Refresh scheduler started")
+        while not self._stop.is_set():
+            try:
+                self.run_pending()
+            except Exception as e:
+                self.logger.error(f"Error in scheduling round: {e}")
+
+            next_run = self._next_due_time()
+            sleep_time = poll_seconds if next_run is None else min(poll_seconds, max(1, next_run - time.time()))
+            self._stop.wait(sleep_time)
+        self.logger.info("Refresh scheduler stopped")
+
+    def stop(self) -> None:
+        """
+        Ask run_forever() to return after the current round.
+        """
+        self._stop.set()
+
+    def run_pending(self, now: Optional[float] = None) -> int:
+        """
+        Run one scheduling round: coalesce the due searches, then fetch them
+        by decreasing expected new jobs per fetch while the budgets allow it.
+
+        Args:
+            now: Current timestamp, defaults to time.time()
+
+        Returns:
+            Number of fetches made
+        """
+        now = now or time.time()
+        with self._lock:
+            due = [dict(row) for row in self._conn.execute(
+                "SELECT * FROM saved_searches WHERE enabled = 1 AND next_run <= ?", (now,)
+            ).fetchall()]
+        if not due:
+            return 0
+
+        groups = self._coalesce(due)
+        groups.sort(key=lambda group: self._expected_new_jobs(group, now) / max(1, group['fetches']), reverse=True)
+
+        done = 0
+        for group in groups:
+            board = self.boards[group['board']]
+            fetches_left, tokens_left = self._budget_left(now)
+
+            # Crawl less deep rather than not at all when the budget is short
+            affordable_pages = group['num_pages']
+            if board['fetches_per_page']:
+                affordable_pages = min(affordable_pages, fetches_left // board['fetches_per_page'])
+            if board['tokens_per_page']:
+                affordable_pages = min(affordable_pages, tokens_left // board['tokens_per_page'])
+
+            if affordable_pages < 1:
+                self.logger.info(
+                    f"Budget exhausted, deferring {group['board']} '{group['keywords']}' "
+                    f"({fetches_left} fetches, {tokens_left} LLM tokens left this hour)"
+                )
+                for search in group['searches']:
+                    self._update_search(search['id'], next_run=now + self.BUDGET_RETRY_SECONDS)
+                continue
+
+            group['num_pages'] = affordable_pages
+            group['fetches'] = affordable_pages * board['fetches_per_page']
+            group['tokens'] = affordable_pages * board['tokens_per_page']
+            self._run_group(group, now)
+            done += 1
+        return done
+
+    def _coalesce(self, searches: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # Searches of one board with the same keywords, and the same location when the board
+        # uses it, fetch the same pages: they are fetched once, as deep as the deepest one
+        groups = {}
+        for search in searches:
+            board = self.boards[search['board']]
+            location = search['location'].strip().lower() if board['uses_location'] else ""
+            key = (search['board'], search['keywords'].strip().lower(), location)
+            group = groups.setdefault(key, {
+                'board': search['board'],
+                'keywords': search['keywords'],
+                'location': search['location'] if board['uses_location'] else "",
+                'num_pages': 0,
+                'searches': []
+            })
+            group['num_pages'] = max(group['num_pages'], search['num_pages'])
+            group['searches'].append(search)
+
+        for group in groups.values():
+            board = self.boards[group['board']]
+            group['fetches'] = group['num_pages'] * board['fetches_per_page']
+            group['tokens'] = group['num_pages'] * board['tokens_per_page']
+        return list(groups.values())
+
+    def _expected_new_jobs(self, group: Dict[str, Any], now: float) -> float:
+        # Searches never run come first, their rate is unknown
+        expected = 0.0
+        for search in group['searches']:
+            if search['new_per_hour'] is None or search['last_run'] is None:
+                return math.inf
+            expected += search['new_per_hour'] * (now - search['last_run']) / 3600
+        return expected
+
+    def _run_group(self, group: Dict[str, Any], now: float) -> None:
+        board = self.boards[group['board']]
+        self.logger.info(
+            f"Refreshing {group['board']} '{group['keywords']}' {group['location']} "
+            f"({group['num_pages']} pages, {len(group['searches'])} saved searches)"
+        )
+
+        self._spend(now, group['fetches'], group['tokens'])
+        try:
+            jobs = board['search'](group['keywords'], group['location'], group['num_pages'])
+        except Exception as e:
+            self.logger.error(f"Error refreshing {group['board']} '{group['keywords']}': {e}")
+            for search in group['searches']:
+                # Retry after the shortest interval, keeping the learned schedule
+                self._update_search(search['id'], next_run=now + self.min_interval)
+            return
+
+        new_jobs = self._record_seen(group['board'], jobs, now)
+        self.logger.info(f"{len(new_jobs)} new jobs out of {len(jobs)}")
+        if new_jobs and self.on_new_jobs:
+            self.on_new_jobs(group['board'], new_jobs)
+
+        crawl_stats = board['crawl_stats']() if board.get('crawl_stats') else {}
+        unfinished_tasks = sum(crawl_stats.get(state, 0) for state in ('pending', 'leased', 'failed'))
+        for search in group['searches']:
+            if unfinished_tasks:
+                # Partial crawl: resume it soon, its failed pages say nothing about the postings rate
+                self.logger.warning(f"Partial refresh of search {search['id']}, not learning from it")
+                self._update_search(search['id'], next_run=now + self.min_interval)
+            elif not jobs and search['jobs_per_page']:
+                # A search that used to return jobs and suddenly returns none was most likely
+                # blocked or broken by a markup change, rather than emptied
+                self.logger.warning(f"No jobs for search {search['id']} which used to have some, not learning from it")
+                self._update_search(search['id'], next_run=now + search['interval_seconds'])
+            else:
+                self._learn(search, len(jobs), len(new_jobs), group['num_pages'], now)
+
+    def _learn(self, search: Dict[str, Any], total_jobs: int, new_jobs: int, num_pages: int, now: float) -> None:
+        jobs_per_page = search['jobs_per_page']
+        if total_jobs:
+            observed = total_jobs / num_pages
+            jobs_per_page = observed if jobs_per_page is None else (
+                self.RATE_SMOOTHING * observed + (1 - self.RATE_SMOOTHING) * jobs_per_page
+            )
+
+        rate = search['new_per_hour']
+        if search['last_run'] is not None:
+            observed_rate = new_jobs / max((now - search['last_run']) / 3600, 1 / 3600)
+            if total_jobs and new_jobs >= self.SATURATION_RATIO * total_jobs:
+                # Almost everything was new: the run was too shallow, the real rate is higher
+                observed_rate *= 2
+            rate = observed_rate if rate is None else (
+                self.RATE_SMOOTHING * observed_rate + (1 - self.RATE_SMOOTHING) * rate
+            )
+
+        interval, num_pages = self._plan(rate, jobs_per_page)
+        self._update_search(
+            search['id'],
+            new_per_hour=rate,
+            jobs_per_page=jobs_per_page,
+            interval_seconds=interval,
+            num_pages=num_pages,
+            runs=search['runs'] + 1,
+            last_run=now,
+            next_run=now + interval
+        )
+
+    def _plan(self, rate: Optional[float], jobs_per_page: Optional[float]) -> tuple:
+        # Before the rate is known (first run only seeds the seen jobs), refresh soon with one page
+        if rate is None or not jobs_per_page:
+            return self.min_interval, 1
+
+        if rate <= 0:
+            return self.max_interval, 1
+
+        # Refresh when about TARGET_PAGE_FILL of a page of new jobs is expected, and crawl deep
+        # enough for the jobs expected over the interval (deeper when the interval is clamped)
+        interval = self.TARGET_PAGE_FILL * jobs_per_page / rate * 3600
+        interval = min(self.max_interval, max(self.min_interval, interval))
+        expected_new = rate * interval / 3600
+        num_pages = math.ceil(self.DEPTH_MARGIN * expected_new / jobs_per_page)
+        return interval, min(self.max_pages, max(1, num_pages))
+
+    def _record_seen(self, board: str, jobs: List[Dict[str, Any]], now: float) -> List[Dict[str, Any]]:
+        new_jobs = []
+        with self._lock, self._conn:
+            for job in jobs:
+                url = job.get('url') or job.get('job_url')
+                if not url:
+                    continue
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO seen_jobs (board, url, first_seen) VALUES (?, ?, ?)", (board, url, now)
+                )
+                if cursor.rowcount:
+                    new_jobs.append(job)
+        return new_jobs
+
+    def _update_search(self, search_id: int, **values: Any) -> None:
+        assignments = ", ".join(f"{column} = ?" for column in values)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"UPDATE saved_searches SET {assignments} WHERE id = ?", list(values.values()) + [search_id]
+            )
+
+    def _spend(self, now: float, fetches: int, llm_tokens: int) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO budget_usage (spent_at, fetches, llm_tokens) VALUES (?, ?, ?)", (now, fetches, llm_tokens)
+            )
+            self._conn.execute("DELETE FROM budget_usage WHERE spent_at < ?", (now - 3600,))
+
+    def _budget_left(self, now: float) -> tuple:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COALESCE(SUM(fetches), 0) AS fetches, COALESCE(SUM(llm_tokens), 0) AS llm_tokens "
+                "FROM budget_usage WHERE spent_at >= ?", (now - 3600,)
+            ).fetchone()
+        return self.fetches_per_hour - row['fetches'], self.llm_tokens_per_hour - row['llm_tokens']
+
+    def _next_due_time(self) -> Optional[float]:
+        with self._lock:
+            row = self._conn.execute("SELECT MIN(next_run) AS next_run FROM saved_searches WHERE enabled = 1").fetchone()
+        return row['next_run']
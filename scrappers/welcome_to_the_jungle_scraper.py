@@ -1,7 +1,9 @@
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 from scrappers.base_scraper import BaseScraper
+from databases.crawl_queue import CrawlQueue
 import re
+import json
 import urllib.parse
 
 class WelcomeToTheJungleScraper(BaseScraper):
@@ -11,9 +13,33 @@ class WelcomeToTheJungleScraper(BaseScraper):
     
     BASE_URL = "https://www.welcometothejungle.com"
     SEARCH_URL = f"{BASE_URL}/fr/jobs"
+    SOURCE_NAME = 'Welcome to the Jungle'
+    COOKIE_CONSENT_SELECTOR = "#axeptio_btn_acceptAll"
 
-    def __init__(self):
-        super().__init__()
+    # Job listings are served by Algolia multi-queries
+    JSON_CAPTURE_PATTERNS = [r"algolia\.net/1/indexes/.*/queries"]
+    JSON_EXTRACTION = {
+        'items': 'results.0.hits',
+        'fields': {
+            'job_name': 'name',
+            'job_company': 'organization.name',
+            'job_location': lambda item: [office.get('city') for office in item.get('offices') or []],
+            'job_contract_type': 'contract_type',
+            'job_remote_status': 'remote',
+            'job_posted_time': 'published_at',
+            'job_description': 'summary',
+            'job_salary': lambda item: " - ".join(
+                str(item[key]) for key in ('salary_minimum', 'salary_maximum') if item.get(key)
+            ) or None,
+            'job_url': lambda item: f"https://www.welcometothejungle.com/fr/companies/"
+                                    f"{(item.get('organization') or {}).get('slug')}/jobs/{item.get('slug')}"
+        }
+    }
+    # Algolia pages are 0-based
+    JSON_API_PAGE_OFFSET = -1
+
+    def __init__(self, crawl_queue: Optional[CrawlQueue] = None, lightweight: bool = True, capture_mode: bool = False):
+        super().__init__(crawl_queue=crawl_queue, lightweight=lightweight, capture_mode=capture_mode)
 
     def search_jobs(self, keywords: str, location: str, num_pages: int = 1) -> List[Dict[str, Any]]:
         """
@@ -25,150 +51,226 @@ class WelcomeToTheJungleScraper(BaseScraper):
             num_pages: Number of pages to scrape
             
         Returns:
-            List of job listings
+            List of job listings (title, company, location, contract_type, remote_status,
+            posted_time, description, url, source). In capture mode, the description is
+            the short summary of the search API instead of the full job page, and the
+            salary is filled when the company published it.
         """
-        jobs = []
+        self.reset_fetch_stats()
+        if self.capture_mode:
+            jobs = self.search_jobs_with_json_api(self._get_search_url(keywords, location, 1), num_pages)
+            if jobs is not None:
+                return jobs
+            self.logger.warning("JSON API not available, falling back to HTML scraping")
+
+        run_id = self.start_run(keywords, location, num_pages)
         
         for page in range(1, num_pages + 1):
-            params = {
-                'query': keywords,
-                'page': page,
-                'aroundQuery': location,
-                'sortBy': 'mostRecent'
-            }
-            search_url = f"{self.SEARCH_URL}?{urllib.parse.urlencode(params).replace('+', '%20')}"
-            self.logger.info(f"Reading page {page}: {search_url}")
-            html_content = self.get_dynamic_page_playwright(search_url)
+            search_url = self._get_search_url(keywords, location, page)
+            self.crawl_queue.enqueue(run_id, 'listing', search_url, {'page': page})
+
+        self.process_queue(run_id, {
+            'listing': lambda task: self._process_listing_page(run_id, task),
+            'detail': self._process_job_detail
+        })
+
+        jobs = self.crawl_queue.results(run_id, 'detail')
+        self.finish_run(run_id)
+        return jobs
+
+    def _get_search_url(self, keywords: str, location: str, page: int) -> str:
+        params = {
+            'query': keywords,
+            'page': page,
+            'aroundQuery': location,
+            'sortBy': 'mostRecent'
+        }
+        return f"{self.SEARCH_URL}?{urllib.parse.urlencode(params).replace('+', '%20')}"
+
+    def build_json_api_request(self, endpoint: Dict[str, Any], page: int) -> Dict[str, Any]:
+        """
+        Build an Algolia multi-query request for a result page.
+        
+        The page number lives in the url-encoded "params" string of each query.
+        
+        Args:
+            endpoint: Captured Algolia endpoint request
+            page: Result page number (1-based)
             
-            if not html_content:
-                continue
-                
-            soup = self.parse_html(html_content)
-            if not soup:
-                continue
+        Returns:
+            Dictionary with the method, url and data of the request
+        """
+        body = json.loads(endpoint['post_data'])
+        for query in body.get('requests', []):
+            params = dict(urllib.parse.parse_qsl(query.get('params', ''), keep_blank_values=True))
+            params['page'] = str(page + self.JSON_API_PAGE_OFFSET)
+            query['params'] = urllib.parse.urlencode(params, quote_via=urllib.parse.quote)
+        
+        return {
+            'method': endpoint['method'],
+            'url': endpoint['url'],
+            'data': json.dumps(body)
+        }
+
+    def _process_listing_page(self, run_id: str, task: Dict[str, Any]) -> Optional[List[str]]:
+        """
+        Parse one search result page and enqueue a detail task for each job card.
+        
+        Args:
+            run_id: Crawl run identifier
+            task: Listing task leased from the crawl queue
+            
+        Returns:
+            URLs of the jobs found on the page, or None if the page could not be fetched
+        """
+        search_url = task['url']
+        self.logger.info(f"Reading page {task['payload']['page']}: {search_url}")
+        html_content = self.get_dynamic_page_playwright(search_url)
+        
+        if not html_content:
+            return None
             
-            # Find all job cards
-            job_cards = soup.find_all('div', {'data-role': 'jobs:thumb'}) 
+        soup = self.parse_html(html_content)
+        if not soup:
+            return None
+        
+        # Find all job cards
+        job_cards = soup.find_all('div', {'data-role': 'jobs:thumb'}) 
 
-            if not job_cards:
-                self.logger.warning("No job cards found")
-                continue
+        if not job_cards:
+            self.logger.warning("No job cards found")
+            return []
 
-            # self.logger.info(f"Found {len(job_cards)} job cards")
+        # self.logger.info(f"Found {len(job_cards)} job cards")
 
-            count = 0
+        job_urls = []
+        count = 0
 
-            for card in job_cards:
-                try:
-                    count += 1
-                    # self.logger.info(f"Processing job {count} on page")
-
-                    # Extract basic job information from card
-                    link = card.find('a')
-                    if not link:
-                        continue
-                        
-                    # Title 
-                    title_elem = "" 
-                    try:
-                        title_card = card.find('h4', {'class': 'wui-text'})
-                        if title_card:
-                            # Extract all text inside any em tags and join them
-                            title_parts = title_card.find_all('em')
-                            title_elem = ' '.join([part.text for part in title_parts]) if title_parts else title_card.text.strip()
-                    except Exception as e:
-                        self.logger.error(f"Error parsing job title: {e}")
-
-                    self.logger.info(f"Processing job {count} - {title_elem}")
-
-                    # Company
-                    company_elem = ""
-                    try:
-                        company_card = card.find('span', {'class': 'wui-text'})
-                        if company_card:
-                            company_elem = company_card.text.strip()
-                    except Exception as e:
-                        self.logger.error(f"Error parsing company name: {e}")
-
-                    # Location
-                    location_elem = ""
-                    try:
-                        location_icon = card.find('i', {'name': 'location'})
-                        if location_icon:
-                            # Navigate to the innermost span that contains the location
-                            location_container = location_icon.find_next('p')
-                            if location_container:
-                                # Get the most deeply nested span with the actual location text
-                                deepest_span = location_container.find('span')
-                                if deepest_span:
-                                    location_elem = deepest_span.text.strip()
-                                else:
-                                    # Fallback to the container text if the specific span isn't found
-                                    location_elem = location_container.text.strip()
-                    except Exception as e:
-                        self.logger.error(f"Error parsing location: {e}")
-                    
-                    # Contract type
-                    contract_type_elem = ""
-                    try:
-                        contract_type_iccon = card.find('i', {'name': 'contract'})
-                        if contract_type_iccon:
-                            contract_type_elem = contract_type_iccon.find_next('span').text.strip()
-                    except Exception as e:
-                        self.logger.error(f"Error parsing contract type: {e}")
-
-                    # Remote status
-                    remote_status_elem = ""
-                    try:
-                        remote_status_icon = card.find('i', {'name': 'remote'})
-                        if remote_status_icon:
-                            remote_status_elem = remote_status_icon.find_next('span').text.strip()
-                    except Exception as e:
-                        self.logger.error(f"Error parsing remote status: {e}")
-
-                    # Posted time
-                    posted_time_elem = ""
-                    try:
-                        date_icon = card.find('i', {'name': 'date'})
-                        if date_icon and date_icon.find_next('p'):
-                            time_elem = date_icon.find_next('p').find('time')
-                            if time_elem:
-                                # Get the standardized datetime attribute
-                                posted_time_elem = time_elem.get('datetime') if time_elem.get('datetime') else time_elem.text.strip()
-                    except Exception as e:
-                        self.logger.error(f"Error parsing posted time: {e}")
-                                        
-                    if not all([title_elem, company_elem, location_elem]):
-                        continue
-                        
-                    # Clean company text to remove "chez"
-                    company_name = company_elem.replace('chez', '').strip()
-                    
-                    job_url = f"{self.BASE_URL}{link['href']}"
-                    
-                    job_info = {
-                        'title': self.clean_text(title_elem),
-                        'company': company_name,
-                        'location': self.clean_text(location_elem),
-                        'contract_type': self.clean_text(contract_type_elem),
-                        'remote_status': self.clean_text(remote_status_elem),
-                        'posted_time': self.clean_text(posted_time_elem),
-                        'url': job_url,
-                        'source': 'Welcome to the Jungle'
-                    }
-
-                    # Get detailed information
-                    detailed_info = self.get_job_details(job_url)
-                    if detailed_info:
-                        job_info["description"] = detailed_info.get('description', "")
-                    
-                    jobs.append(job_info)
+        for card in job_cards:
+            try:
+                count += 1
+                # self.logger.info(f"Processing job {count} on page")
+
+                # Extract basic job information from card
+                link = card.find('a')
+                if not link:
+                    continue
                     
+                # Title 
+                title_elem = "" 
+                try:
+                    title_card = card.find('h4', {'class': 'wui-text'})
+                    if title_card:
+                        # Extract all text inside any em tags and join them
+                        title_parts = title_card.find_all('em')
+                        title_elem = ' '.join([part.text for part in title_parts]) if title_parts else title_card.text.strip()
+                except Exception as e:
+                    self.logger.error(f"Error parsing job title: {e}")
+
+                self.logger.info(f"Processing job {count} - {title_elem}")
+
+                # Company
+                company_elem = ""
+                try:
+                    company_card = card.find('span', {'class': 'wui-text'})
+                    if company_card:
+                        company_elem = company_card.text.strip()
+                except Exception as e:
+                    self.logger.error(f"Error parsing company name: {e}")
+
+                # Location
+                location_elem = ""
+                try:
+                    location_icon = card.find('i', {'name': 'location'})
+                    if location_icon:
+                        # Navigate to the innermost span that contains the location
+                        location_container = location_icon.find_next('p')
+                        if location_container:
+                            # Get the most deeply nested span with the actual location text
+                            deepest_span = location_container.find('span')
+                            if deepest_span:
+                                location_elem = deepest_span.text.strip()
+                            else:
+                                # Fallback to the container text if the specific span isn't found
+                                location_elem = location_container.text.strip()
+                except Exception as e:
+                    self.logger.error(f"Error parsing location: {e}")
+                
+                # Contract type
+                contract_type_elem = ""
+                try:
+                    contract_type_iccon = card.find('i', {'name': 'contract'})
+                    if contract_type_iccon:
+                        contract_type_elem = contract_type_iccon.find_next('span').text.strip()
+                except Exception as e:
+                    self.logger.error(f"Error parsing contract type: {e}")
+
+                # Remote status
+                remote_status_elem = ""
+                try:
+                    remote_status_icon = card.find('i', {'name': 'remote'})
+                    if remote_status_icon:
+                        remote_status_elem = remote_status_icon.find_next('span').text.strip()
                 except Exception as e:
-                    self.logger.error(f"Error parsing job card: {e}")
+                    self.logger.error(f"Error parsing remote status: {e}")
+
+                # Posted time
+                posted_time_elem = ""
+                try:
+                    date_icon = card.find('i', {'name': 'date'})
+                    if date_icon and date_icon.find_next('p'):
+                        time_elem = date_icon.find_next('p').find('time')
+                        if time_elem:
+                            # Get the standardized datetime attribute
+                            posted_time_elem = time_elem.get('datetime') if time_elem.get('datetime') else time_elem.text.strip()
+                except Exception as e:
+                    self.logger.error(f"Error parsing posted time: {e}")
+                                    
+                if not all([title_elem, company_elem, location_elem]):
                     continue
                     
-        return jobs
+                # Clean company text to remove "chez"
+                company_name = company_elem.replace('chez', '').strip()
+                
+                job_url = f"{self.BASE_URL}{link['href']}"
+                
+                job_info = {
+                    'title': self.clean_text(title_elem),
+                    'company': company_name,
+                    'location': self.clean_text(location_elem),
+                    'contract_type': self.clean_text(contract_type_elem),
+                    'remote_status': self.clean_text(remote_status_elem),
+                    'posted_time': self.clean_text(posted_time_elem),
+                    'url': job_url,
+                    'source': self.SOURCE_NAME
+                }
+
+                # Detailed information is fetched by the detail task
+                self.crawl_queue.enqueue(run_id, 'detail', job_url, job_info)
+                job_urls.append(job_url)
+                
+            except Exception as e:
+                self.logger.error(f"Error parsing job card: {e}")
+                continue
+                
+        return job_urls
+
+    def _process_job_detail(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Complete a job card with the details of its job page.
+        
+        Args:
+            task: Detail task leased from the crawl queue, carrying the job card
+            
+        Returns:
+            The job listing with its description
+        """
+        job_info = task['payload']
+        detailed_info = self.get_job_details(task['url'])
+        if detailed_info:
+            job_info["description"] = detailed_info.get('description', "")
+        
+        return job_info
 
     def get_job_details(self, job_url: str) -> Optional[Dict[str, Any]]:
         """
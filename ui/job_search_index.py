@@ -0,0 +1,485 @@
+import re
+import hashlib
+import sqlite3
+import threading
+from collections import Counter
+from typing import Dict, List, Any, Optional, Iterable
+from config import JOB_INDEX_PATH
+from models.job_record import JobRecord
+
+
+class JobSearchIndex:
+    """
+    Full-text search index over scraped jobs, backing the ui.
+
+    Jobs are stored in SQLite with an FTS5 inverted index over title,
+    company, description and required skills, ranked with BM25. Searches
+    combine full-text matching with facet filters and keyset pagination,
+    and new jobs are indexed incrementally as they arrive.
+
+    Attributes:
+        db_path (str): Path of the SQLite database (":memory:" for a throwaway index)
+    """
+
+    # BM25 weights of the indexed columns: title, company, description, required skills, facets
+    BM25_WEIGHTS = (10.0, 4.0, 1.0, 3.0, 0.0)
+
+    # Columns searched by the query text, the hidden facets column is only matched by filters
+    TEXT_COLUMNS = ('title', 'company', 'description', 'required_skills')
+
+    FACETS = ('contract_type', 'remote_status', 'location', 'source')
+
+    # Facet tokens start with a private use character: the tokenizer keeps it inside tokens,
+    # while query words (\w+) never contain it, so typed text can never produce a facet token
+    FACET_TOKEN_MARK = "\ue000"
+
+    # Prefix of the facet tokens indexed in the hidden "facets" full-text column
+    FACET_TOKEN_PREFIXES = {
+        'contract_type': 'ct',
+        'remote_status': 'rs',
+        'location': 'lo',
+        'source': 'so',
+        'has_salary': 'sa',
+    }
+
+    RESULT_COLUMNS = (
+        'id', 'title', 'company', 'location', 'contract_type', 'remote_status',
+        'posted_time', 'salary', 'url', 'source'
+    )
+
+    # Text searches rank the most recently indexed matches only. FTS5 reads matches in rowid
+    # order and stops early, while ranking every match of a common word costs hundreds of ms
+    MAX_RANKED_CANDIDATES = 500
+
+    # Version of the index format (facet tokens, full-text options), stored in the database user_version
+    SCHEMA_VERSION = 2
+
+    def __init__(self, db_path: str = JOB_INDEX_PATH, max_ranked_candidates: Optional[int] = MAX_RANKED_CANDIDATES):
+        """
+        Open (and create if needed) the index database.
+
+        Args:
+            db_path: Path of the SQLite database file
+            max_ranked_candidates: Number of most recently indexed matches ranked by a text search
+                and counted by facet_counts. None ranks every match, which is exact but slow for
+                common words on large indexes.
+        """
+        self.db_path = db_path
+        self.max_ranked_candidates = max_ranked_candidates
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        rebuild = self._migrate()
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY,
+                url TEXT NOT NULL UNIQUE,
+                title TEXT NOT NULL,
+                company TEXT COLLATE NOCASE,
+                location TEXT COLLATE NOCASE,
+                contract_type TEXT COLLATE NOCASE,
+                remote_status TEXT COLLATE NOCASE,
+                posted_time TEXT,
+                salary TEXT,
+                has_salary INTEGER NOT NULL DEFAULT 0,
+                description TEXT,
+                profile TEXT,
+                required_skills TEXT,
+                source TEXT COLLATE NOCASE,
+                facets TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_contract_type ON jobs (contract_type, id);
+            CREATE INDEX IF NOT EXISTS idx_jobs_remote_status ON jobs (remote_status, id);
+            CREATE INDEX IF NOT EXISTS idx_jobs_location ON jobs (location, id);
+            CREATE INDEX IF NOT EXISTS idx_jobs_has_salary ON jobs (has_salary, id);
+
+            CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+                title, company, description, required_skills, facets,
+                content='jobs', content_rowid='id', tokenize='unicode61 remove_diacritics 2', prefix='2 3 4'
+            );
+
+            -- Number of jobs per combination of facet values, so facet counts without query text
+            -- read a few thousand rows at most instead of every job
+            CREATE TABLE IF NOT EXISTS facet_combos (
+                contract_type TEXT COLLATE NOCASE NOT NULL,
+                remote_status TEXT COLLATE NOCASE NOT NULL,
+                location TEXT COLLATE NOCASE NOT NULL,
+                source TEXT COLLATE NOCASE NOT NULL,
+                has_salary INTEGER NOT NULL,
+                n INTEGER NOT NULL,
+                PRIMARY KEY (contract_type, remote_status, location, source, has_salary)
+            );
+
+            CREATE TRIGGER IF NOT EXISTS jobs_ai AFTER INSERT ON jobs BEGIN
+                INSERT INTO jobs_fts (rowid, title, company, description, required_skills, facets)
+                VALUES (new.id, new.title, new.company, new.description, new.required_skills, new.facets);
+                INSERT INTO facet_combos (contract_type, remote_status, location, source, has_salary, n)
+                VALUES (coalesce(new.contract_type, ''), coalesce(new.remote_status, ''), coalesce(new.location, ''), coalesce(new.source, ''), new.has_salary, 1)
+                ON CONFLICT DO UPDATE SET n = n + 1;
+            END;
+            CREATE TRIGGER IF NOT EXISTS jobs_ad AFTER DELETE ON jobs BEGIN
+                INSERT INTO jobs_fts (jobs_fts, rowid, title, company, description, required_skills, facets)
+                VALUES ('delete', old.id, old.title, old.company, old.description, old.required_skills, old.facets);
+                UPDATE facet_combos SET n = n - 1
+                WHERE contract_type = coalesce(old.contract_type, '') AND remote_status = coalesce(old.remote_status, '')
+                    AND location = coalesce(old.location, '') AND source = coalesce(old.source, '') AND has_salary = old.has_salary;
+            END;
+            CREATE TRIGGER IF NOT EXISTS jobs_au AFTER UPDATE ON jobs BEGIN
+                INSERT INTO jobs_fts (jobs_fts, rowid, title, company, description, required_skills, facets)
+                VALUES ('delete', old.id, old.title, old.company, old.description, old.required_skills, old.facets);
+                INSERT INTO jobs_fts (rowid, title, company, description, required_skills, facets)
+                VALUES (new.id, new.title, new.company, new.description, new.required_skills, new.facets);
+                UPDATE facet_combos SET n = n - 1
+                WHERE contract_type = coalesce(old.contract_type, '') AND remote_status = coalesce(old.remote_status, '')
+                    AND location = coalesce(old.location, '') AND source = coalesce(old.source, '') AND has_salary = old.has_salary;
+                INSERT INTO facet_combos (contract_type, remote_status, location, source, has_salary, n)
+                VALUES (coalesce(new.contract_type, ''), coalesce(new.remote_status, ''), coalesce(new.location, ''), coalesce(new.source, ''), new.has_salary, 1)
+                ON CONFLICT DO UPDATE SET n = n + 1;
+            END;
+            """
+        )
+        weights = ", ".join(str(w) for w in self.BM25_WEIGHTS)
+        self._conn.execute(f"INSERT INTO jobs_fts (jobs_fts, rank) VALUES ('rank', 'bm25({weights})')")
+        if rebuild:
+            self._conn.execute("INSERT INTO jobs_fts (jobs_fts) VALUES ('rebuild')")
+            self._conn.execute("INSERT INTO jobs_fts (jobs_fts) VALUES ('optimize')")
+            self._conn.execute("DELETE FROM facet_combos")
+            self._conn.execute(
+                """
+                INSERT INTO facet_combos (contract_type, remote_status, location, source, has_salary, n)
+                SELECT coalesce(contract_type, ''), coalesce(remote_status, ''), coalesce(location, ''),
+                       coalesce(source, ''), has_salary, 1
+                FROM jobs WHERE true
+                ON CONFLICT DO UPDATE SET n = n + 1
+                """
+            )
+        self._conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        self._conn.commit()
+
+    def add_jobs(self, records: Iterable[JobRecord]) -> int:
+        """
+        Index new jobs, or update jobs already indexed (same URL).
+
+        Args:
+            records: Job records
+
+        Returns:
+            Number of indexed jobs
+        """
+        rows = [
+            (
+                record.url, record.title, record.company, record.location, record.contract_type,
+                record.remote_status, record.posted_time, record.salary, int(bool(record.salary)),
+                record.description, record.profile, record.required_skills, record.source,
+                self._facet_tokens(record)
+            )
+            for record in records if record.url
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                """
+                INSERT INTO jobs (url, title, company, location, contract_type, remote_status, posted_time,
+                                  salary, has_salary, description, profile, required_skills, source, facets)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (url) DO UPDATE SET
+                    title = excluded.title, company = excluded.company, location = excluded.location,
+                    contract_type = excluded.contract_type, remote_status = excluded.remote_status,
+                    posted_time = excluded.posted_time, salary = excluded.salary, has_salary = excluded.has_salary,
+                    description = excluded.description, profile = excluded.profile,
+                    required_skills = excluded.required_skills, source = excluded.source, facets = excluded.facets
+                """,
+                rows
+            )
+        return len(rows)
+
+    def remove_jobs(self, urls: Iterable[str]) -> None:
+        """
+        Remove jobs from the index.
+
+        Args:
+            urls: URLs of the jobs to remove
+        """
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM jobs WHERE url = ?", [(url,) for url in urls])
+
+    def search(self, query: str = "", contract_type: Optional[str] = None, remote_status: Optional[str] = None,
+               location: Optional[str] = None, has_salary: Optional[bool] = None, source: Optional[str] = None,
+               limit: int = 20, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Search jobs with full-text matching, facet filters and keyset pagination.
+
+        The last word of the query is matched as a prefix, so partial input
+        typed in the ui already returns results. Text searches return the
+        best BM25 matches among the max_ranked_candidates most recently
+        indexed matches (all matches when it is None), filter-only searches
+        list the most recently indexed jobs first.
+
+        Args:
+            query: Free text query
+            contract_type: Contract type filter
+            remote_status: Remote status filter
+            location: Location filter
+            has_salary: Keep only jobs with (True) or without (False) a salary
+            source: Job board filter
+            limit: Page size
+            cursor: next_cursor of the previous page, or None for the first page
+
+        Returns:
+            Dictionary with the page "results", the "next_cursor" (None on the last page) and
+            "truncated", True when older matches were left out by max_ranked_candidates
+        """
+        filters = {
+            'contract_type': contract_type, 'remote_status': remote_status,
+            'location': location, 'has_salary': has_salary, 'source': source
+        }
+        match = self._build_match_query(query, filters)
+        where, params = self._build_filters(**filters)
+        columns = ", ".join(f"jobs.{column}" for column in self.RESULT_COLUMNS)
+
+        truncated = False
+        with self._lock:
+            if match:
+                # Filters are part of the full-text match (facet tokens), so FTS5 intersects the
+                # posting lists itself. Columns and snippets are only read for the returned page
+                if self.max_ranked_candidates:
+                    candidates, truncated = self._match_candidates(query, filters, with_rank=True)
+                    ranked = sorted((row['rank'], row['id']) for row in candidates)
+                    if cursor:
+                        last_rank, last_id = cursor.split("|")
+                        ranked = [key for key in ranked if key > (float(last_rank), int(last_id))]
+                    ranked = [{'rank': rank, 'id': job_id} for rank, job_id in ranked[:limit + 1]]
+                else:
+                    sql = "SELECT rowid AS id, rank FROM jobs_fts WHERE jobs_fts MATCH ?"
+                    params = [match]
+                    if cursor:
+                        last_rank, last_id = cursor.split("|")
+                        sql += " AND (rank > ? OR (rank = ? AND id > ?))"
+                        params += [float(last_rank), float(last_rank), int(last_id)]
+                    sql += " ORDER BY rank, id LIMIT ?"
+                    params.append(limit + 1)
+                    ranked = self._conn.execute(sql, params).fetchall()
+
+                ids = [row['id'] for row in ranked[:limit]]
+                placeholders = ", ".join("?" * len(ids))
+                details = {
+                    row['id']: dict(row) for row in self._conn.execute(
+                        f"SELECT {columns}, jobs.description FROM jobs WHERE jobs.id IN ({placeholders})", ids
+                    ).fetchall()
+                }
+                rows = []
+                for row in ranked[:limit]:
+                    job = details[row['id']]
+                    job['snippet'] = self._snippet(job.pop('description'), query)
+                    job['rank'] = row['rank']
+                    rows.append(job)
+                has_more = len(ranked) > limit
+            else:
+                sql = f"SELECT {columns} FROM jobs"
+                if cursor:
+                    where.append("jobs.id < ?")
+                    params.append(int(cursor))
+                if where:
+                    sql += " WHERE " + " AND ".join(where)
+                sql += " ORDER BY jobs.id DESC LIMIT ?"
+                params.append(limit + 1)
+                rows = [dict(row) for row in self._conn.execute(sql, params).fetchall()]
+                has_more = len(rows) > limit
+                rows = rows[:limit]
+
+        next_cursor = None
+        if has_more:
+            last = rows[-1]
+            next_cursor = f"{last['rank']!r}|{last['id']}" if match else str(last['id'])
+
+        return {'results': rows, 'next_cursor': next_cursor, 'truncated': truncated}
+
+    def facet_counts(self, query: str = "", **filters: Any) -> Dict[str, Dict[str, int]]:
+        """
+        Count the matching jobs per facet value, to display next to the ui filters.
+
+        Text searches count the same max_ranked_candidates most recent matches
+        that search() ranks, so the counts match the jobs it can return.
+
+        Args:
+            query: Free text query
+            filters: Same facet filters as search()
+
+        Returns:
+            Dictionary mapping each facet to its value counts, plus "has_salary"
+        """
+        facets = self.FACETS + ('has_salary',)
+        match = self._build_match_query(query, filters)
+
+        with self._lock:
+            if not match:
+                where, params = self._build_filters(**filters, table='facet_combos')
+                where_sql = "".join(f" AND {clause}" for clause in where)
+                rows = self._conn.execute(
+                    f"SELECT {', '.join(facets)}, n FROM facet_combos WHERE n > 0{where_sql}", params
+                ).fetchall()
+                return self._count_facets(rows, weighted=True)
+
+            if self.max_ranked_candidates:
+                candidates, _ = self._match_candidates(query, filters, with_rank=False)
+                ids = [row['id'] for row in candidates]
+                rows = self._conn.execute(
+                    f"SELECT {', '.join(facets)} FROM jobs WHERE id IN ({', '.join('?' * len(ids))})", ids
+                ).fetchall()
+                return self._count_facets(rows, weighted=False)
+
+            where, params = self._build_filters(**filters)
+            where.insert(0, "jobs.id IN (SELECT rowid FROM jobs_fts WHERE jobs_fts MATCH ?)")
+            params.insert(0, match)
+            rows = self._conn.execute(
+                f"SELECT {', '.join(facets)}, COUNT(*) AS n FROM jobs WHERE {' AND '.join(where)} "
+                f"GROUP BY {', '.join(facets)}",
+                params
+            ).fetchall()
+            return self._count_facets(rows, weighted=True)
+
+    def get_job(self, job_id: int) -> Optional[JobRecord]:
+        """
+        Get the full record of an indexed job.
+
+        Args:
+            job_id: Identifier returned in the search results
+
+        Returns:
+            The job record, or None if not found
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        return JobRecord(**{field: row[field] for field in JobRecord.__slots__})
+
+    def count(self) -> int:
+        """
+        Number of indexed jobs.
+        """
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def optimize(self) -> None:
+        """
+        Merge the FTS5 index segments, to run after large imports.
+        """
+        with self._lock, self._conn:
+            self._conn.execute("INSERT INTO jobs_fts (jobs_fts) VALUES ('optimize')")
+
+    def close(self) -> None:
+        """
+        Close the database connection.
+        """
+        self._conn.close()
+
+    def _build_match_query(self, query: str, filters: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        # Words are quoted so FTS5 syntax in user input is never interpreted. Only the last
+        # word, still being typed, is a prefix: prefix terms merge many doclists and are costly
+        terms = re.findall(r"\w+", query or "")
+        if not terms:
+            return None
+        words = " ".join(f'"{term}"' for term in terms[:-1]) + f' "{terms[-1]}"*'
+        match = f"{{{' '.join(self.TEXT_COLUMNS)}}} : ({words})"
+
+        facet_tokens = [
+            self._facet_token(facet, value) for facet, value in (filters or {}).items() if value is not None
+        ]
+        if facet_tokens:
+            match = f"({match}) AND facets : ({' '.join(facet_tokens)})"
+        return match
+
+    def _match_candidates(self, query: str, filters: Dict[str, Any], with_rank: bool) -> tuple:
+        # The most recently indexed matches, read in rowid order so FTS5 stops early. One extra
+        # row tells whether older matches were left out, without a second MATCH
+        rank = ", rank" if with_rank else ""
+        rows = self._conn.execute(
+            f"SELECT rowid AS id{rank} FROM jobs_fts WHERE jobs_fts MATCH ? ORDER BY rowid DESC LIMIT ?",
+            (self._build_match_query(query, filters), self.max_ranked_candidates + 1)
+        ).fetchall()
+        return rows[:self.max_ranked_candidates], len(rows) > self.max_ranked_candidates
+
+    def _count_facets(self, rows: List[sqlite3.Row], weighted: bool) -> Dict[str, Dict[Any, int]]:
+        # Rows hold the facet values of one job, or of a group of "n" jobs when weighted.
+        # Values are compared without case, like the NOCASE facet columns
+        counts = {}
+        for facet in self.FACETS + ('has_salary',):
+            values, labels = Counter(), {}
+            for row in rows:
+                value = row[facet]
+                if value in (None, ""):
+                    continue
+                key = value.lower() if isinstance(value, str) else value
+                labels.setdefault(key, bool(value) if facet == 'has_salary' else value)
+                values[key] += row['n'] if weighted else 1
+            counts[facet] = {labels[key]: n for key, n in values.most_common() if n}
+        return counts
+
+    def _snippet(self, text: Optional[str], query: str, size: int = 16) -> str:
+        # Built in Python for the returned page only: FTS5 snippet() needs a MATCH lookup per row
+        words = (text or "").split()
+        terms = [term.lower() for term in re.findall(r"\w+", query or "")]
+        hits = {i for i, word in enumerate(words) if any(word.lower().startswith(term) for term in terms)}
+        start = max(0, min(hits) - size // 4) if hits else 0
+        window = [
+            f"[{word}]" if i in hits else word
+            for i, word in enumerate(words[start:start + size], start)
+        ]
+        prefix = "…" if start > 0 else ""
+        suffix = "…" if start + size < len(words) else ""
+        return prefix + " ".join(window) + suffix
+
+    def _facet_token(self, facet: str, value: Any) -> str:
+        if facet == 'has_salary':
+            return f"{self.FACET_TOKEN_MARK}{self.FACET_TOKEN_PREFIXES[facet]}{int(bool(value))}"
+        digest = hashlib.md5(str(value).lower().encode('utf-8')).hexdigest()[:16]
+        return f"{self.FACET_TOKEN_MARK}{self.FACET_TOKEN_PREFIXES[facet]}{digest}"
+
+    def _facet_tokens(self, record: JobRecord) -> str:
+        tokens = [self._facet_token('has_salary', record.salary)]
+        for facet in self.FACETS:
+            value = getattr(record, facet)
+            if value:
+                tokens.append(self._facet_token(facet, value))
+        return " ".join(tokens)
+
+    def _migrate(self) -> bool:
+        # Older indexes get their facet tokens rewritten and their full-text table recreated
+        # (prefix indexes changed). Returns whether the full-text index must be rebuilt
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        has_jobs = self._conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'jobs'").fetchone()
+        if not has_jobs or version >= self.SCHEMA_VERSION:
+            return False
+
+        for trigger in ('jobs_ai', 'jobs_ad', 'jobs_au'):
+            self._conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        self._conn.execute("DROP TABLE IF EXISTS jobs_fts")
+
+        if version < 1:
+            facet_columns = self.FACETS + ('salary',)
+            rows = self._conn.execute(f"SELECT id, {', '.join(facet_columns)} FROM jobs").fetchall()
+            self._conn.executemany(
+                "UPDATE jobs SET facets = ? WHERE id = ?",
+                [
+                    (self._facet_tokens(JobRecord(title="", url="", **{column: row[column] for column in facet_columns})),
+                     row['id'])
+                    for row in rows
+                ]
+            )
+        return True
+
+    def _build_filters(self, contract_type: Optional[str] = None, remote_status: Optional[str] = None,
+                       location: Optional[str] = None, has_salary: Optional[bool] = None,
+                       source: Optional[str] = None, table: str = 'jobs') -> tuple:
+        where, params = [], []
+        for column, value in (('contract_type', contract_type), ('remote_status', remote_status),
+                              ('location', location), ('source', source)):
+            if value is not None:
+                where.append(f"{table}.{column} = ?")
+                params.append(value)
+        if has_salary is not None:
+            where.append(f"{table}.has_salary = ?")
+            params.append(int(has_salary))
+        return where, params